@@ -0,0 +1,81 @@
+"""Time job, company and listing page parsing: the old html.parser/select_one-twice approach vs the compiled lxml field tables.
+
+Usage:
+    python scripts/benchmark_parsing.py job.html company.html listing.html   # saved pages
+    python scripts/benchmark_parsing.py --live 5                             # fetch pages from myjobmag
+"""
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+import lxml.html
+
+import script
+
+
+def baseline_parse(html, fields):
+    """What scrape_job_details used to do: html.parser, then each selector once to test and once to read."""
+    soup = BeautifulSoup(html, 'html.parser')
+    for selectors, many in fields.values():
+        for selector in selectors:
+            if many:
+                soup.select(selector.css)
+            elif soup.select_one(selector.css):
+                soup.select_one(selector.css)
+                break
+
+
+def table_parse(html, fields):
+    script.select_fields(lxml.html.document_fromstring(html), fields)
+
+
+def classify(html):
+    if 'wrap-comp-jobs' in html and 'id="printable"' not in html:
+        return 'company'
+    if 'id="printable"' in html:
+        return 'job'
+    return 'listing'
+
+
+def live_pages(count):
+    pages = [script.fetch('https://www.myjobmag.co.ke/page/1').text]
+    for job_url in script.fetch_listing_page(1)[:count]:
+        html = script.fetch(job_url).text
+        pages.append(html)
+        found = script.parse_job_page(html)
+        links = [a.get('href') for a in found['company_links'] if a.get('href')]
+        if links:
+            pages.append(script.fetch('https://www.myjobmag.co.ke' + links[0]).text)
+    return pages
+
+
+def timed(func, *args, repeat=20):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('files', nargs='*', help='saved HTML pages')
+    parser.add_argument('--live', type=int, default=0, help='fetch this many live job pages instead')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    pages = live_pages(args.live) if args.live else [open(path, encoding='utf-8').read() for path in args.files]
+    if not pages:
+        parser.error('give HTML files or --live N')
+    tables = {
+        'job': script.JOB_PAGE_FIELDS,
+        'company': script.COMPANY_PAGE_FIELDS,
+        'listing': script.LISTING_PAGE_FIELDS,
+    }
+    for html in pages:
+        kind = classify(html)
+        before = timed(baseline_parse, html, tables[kind], repeat=args.repeat)
+        after = timed(table_parse, html, tables[kind], repeat=args.repeat)
+        print(f"{kind:8} {len(html) // 1024:5d} KiB  baseline {before:7.2f} ms  table {after:7.2f} ms  x{before / after:.1f}")
+
+
+if __name__ == '__main__':
+    main()
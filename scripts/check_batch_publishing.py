@@ -0,0 +1,247 @@
+"""End-to-end check of batch publishing (PUBLISH_BATCH_JOBS) against an in-process mock WordPress.
+
+The mock serves the REST routes the publisher uses (job listings, companies, media,
+region/type terms and /batch/v1) and sanitizes slugs the way WordPress does. Paraphrasing
+is replaced by the scraped title and description, so no models are loaded; everything
+from the existing-post lookup to the ledger goes through script.py unchanged.
+
+Usage:
+    python scripts/check_batch_publishing.py            # runs in a temporary directory
+    python scripts/check_batch_publishing.py --keep     # leave the directory (ledger, logs) behind
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+COLLECTIONS = ('job-listings', 'company', 'media', 'job_listing_region', 'job_listing_type')
+TERMS = ('job_listing_region', 'job_listing_type')
+
+
+class MockWordPress:
+    """In-memory WordPress REST API.
+
+    `fail` maps a slug to the error statuses its next creates return; `lose` holds slugs whose
+    next create succeeds but answers 500, like a response lost after the post was saved.
+    """
+
+    def __init__(self, slugify, batch=True):
+        self.slugify = slugify
+        self.batch = batch
+        self.items = {name: [] for name in COLLECTIONS}
+        self.next_id = 1
+        self.fail = {}
+        self.lose = set()
+        self.requests = Counter()
+        self.lock = threading.Lock()
+
+    def add(self, collection, **fields):
+        item = dict(fields, id=self.next_id)
+        item.setdefault('link', f"/{collection}/{item['slug']}")
+        self.next_id += 1
+        self.items[collection].append(item)
+        return item
+
+    def create(self, collection, body):
+        if collection not in self.items:
+            return 404, {'code': 'rest_no_route', 'data': {'status': 404}}
+        slug = self.slugify(body.get('slug') or body.get('title') or body.get('name') or '')
+        if collection in TERMS:
+            for term in self.items[collection]:
+                if term['slug'] == slug:
+                    return 400, {'code': 'term_exists', 'data': {'status': 400, 'term_id': term['id']}}
+        statuses = self.fail.get(slug)
+        if statuses:
+            status = statuses.pop(0)
+            return status, {'code': 'mock_failure', 'data': {'status': status}}
+        taken = {item['slug'] for item in self.items[collection]}
+        unique, n = slug, 2
+        while unique in taken:
+            unique, n = f"{slug}-{n}", n + 1
+        item = self.add(collection, **dict(body, slug=unique))
+        if slug in self.lose:
+            self.lose.discard(slug)
+            return 500, {'code': 'mock_lost_response', 'data': {'status': 500}}
+        return 201, item
+
+    def handler(self):
+        wp = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def send(self, status, body, headers=None):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def body(self):
+                return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/logo.png':
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'image/png')
+                    self.send_header('Content-Length', '3')
+                    self.end_headers()
+                    self.wfile.write(b'png')
+                    return
+                collection = url.path.rstrip('/').rsplit('/', 1)[-1]
+                query = parse_qs(url.query)
+                with wp.lock:
+                    wp.requests['GET ' + collection] += 1
+                    items = wp.items.get(collection, [])
+                    if 'slug' in query:
+                        # wp_parse_slug_list: split on commas and spaces, sanitize each
+                        wanted = {wp.slugify(s) for s in re.split(r'[\s,]+', query['slug'][0]) if s}
+                        items = [item for item in items if item['slug'] in wanted]
+                    per_page = int(query.get('per_page', ['10'])[0])
+                    page = int(query.get('page', ['1'])[0])
+                    pages = max(1, -(-len(items) // per_page))
+                    self.send(200, items[(page - 1) * per_page:page * per_page], {'X-WP-TotalPages': str(pages)})
+
+            def do_POST(self):
+                path = urlparse(self.path).path
+                raw = self.body()
+                with wp.lock:
+                    if path.endswith('/batch/v1'):
+                        wp.requests['POST batch'] += 1
+                        if not wp.batch:
+                            return self.send(404, {'code': 'rest_no_route', 'data': {'status': 404}})
+                        calls = json.loads(raw)['requests']
+                        if len(calls) > 25:
+                            return self.send(400, {'code': 'rest_batch_max_requests'})
+                        responses = []
+                        for call in calls:
+                            status, body = wp.create(call['path'].rstrip('/').rsplit('/', 1)[-1], call.get('body', {}))
+                            responses.append({'status': status, 'body': body, 'headers': {}})
+                        return self.send(207, {'responses': responses})
+                    collection = path.rstrip('/').rsplit('/', 1)[-1]
+                    wp.requests['POST ' + collection] += 1
+                    if collection == 'media':
+                        filename = self.headers.get('Content-Disposition', '').rsplit('=', 1)[-1]
+                        return self.send(201, wp.add('media', slug=wp.slugify(filename), title=filename))
+                    self.send(*wp.create(collection, json.loads(raw)))
+
+        return Handler
+
+
+def queued_job(base_url, k, title, company):
+    job_data = {
+        'Job ID': f'job-{k}',
+        'Job URL': f'https://www.myjobmag.co.ke/job/check-{k}',
+        'Job Title': title,
+        'Job Description': f'Description of {title}.',
+        'Company': company,
+        'Company Logo': f'{base_url}/logo.png',
+        'Location': 'Nairobi, Kenya',
+        'Job Type': 'Full-time',
+        'Application': 'jobs@example.com',
+    }
+    return (1, k, job_data, {'company_name': company}, None, None)
+
+
+def run(script, wp, jobs):
+    inbox = script.queue.Queue()
+    for job in jobs:
+        inbox.put(job)
+    inbox.put(script.STAGE_DONE)
+    published = []
+
+    class Pages:
+        def published(self, page):
+            published.append(page)
+
+    script.wp_entity_cache.reset()
+    script.publish_stage(inbox, Pages(), set())
+    script.get_processed_jobs_ledger().flush()
+    return len(published)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keep', action='store_true', help='keep the working directory')
+    args = parser.parse_args()
+    workdir = tempfile.mkdtemp(prefix='check-batch-')
+    os.chdir(workdir)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BaseHTTPRequestHandler)
+    base_url = f'http://127.0.0.1:{server.server_port}'
+    os.environ['WP_BASE_URL'] = base_url
+    os.environ['PUBLISH_BATCH_JOBS'] = '30'
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import script
+
+    script.configure_logging()
+    # Publishing is under test, not paraphrasing: post the scraped title and description as they are
+    script.rewrite_job = lambda index, job_data, paraphrased: (job_data['Job Title'], job_data['Job Description'])
+    wp = MockWordPress(script.wp_slug)
+    server.RequestHandlerClass = wp.handler()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    wp.add('job-listings', slug='accountant-finance-admin', title='Accountant, Finance & Admin')
+    wp.add('company', slug='acme-ltd', title='Acme Ltd.')
+    titles = [f'Data Analyst {k}' for k in range(26)]
+    titles[1] = 'Accountant, Finance & Admin'   # already published, punctuated slug
+    titles[2] = 'Data Analyst 3'                # same slug as job 3: published once
+    wp.fail['data-analyst-4'] = [500]           # retried inside the next batch round
+    wp.fail['data-analyst-5'] = [400]           # not retryable in a batch: posted on its own
+    wp.fail['data-analyst-6'] = [400, 500, 500, 500]  # fails on its own too: left for the next run
+    wp.lose.add('procter-gamble')               # created, but the batch reports an error
+    companies = ['Acme Ltd.', 'Procter & Gamble', 'Foo, Inc']
+    jobs = [queued_job(base_url, k, title, companies[k % 3]) for k, title in enumerate(titles)]
+
+    failures = []
+
+    def check(label, ok, detail=''):
+        print(f"{'ok  ' if ok else 'FAIL'} {label} {detail}")
+        if not ok:
+            failures.append(label)
+
+    published = run(script, wp, jobs)
+    ledger = script.get_processed_jobs_ledger()
+    slugs = Counter(item['slug'] for item in wp.items['job-listings'])
+    check('every queued job released', published == len(jobs), f'({published}/{len(jobs)})')
+    check('published jobs recorded as processed', all(f'job-{k}' in ledger.view('job_id') for k in range(len(jobs)) if k != 6))
+    check('failed job not recorded', 'job-6' not in ledger.view('job_id'))
+    check('no duplicate job posts', not [s for s, n in slugs.items() if n > 1 or re.search(r'-\d+-\d+$', s)], dict(slugs))
+    check('23 new job posts', len(wp.items['job-listings']) == 1 + 23, f"({len(wp.items['job-listings']) - 1})")
+    check('no duplicate companies', sorted(c['slug'] for c in wp.items['company']) == ['acme-ltd', 'foo-inc', 'procter-gamble'])
+    check('companies, jobs and one retry in 3 batch calls', wp.requests['POST batch'] == 3, dict(wp.requests))
+    check('rejected jobs posted on their own', wp.requests['POST job-listings'] == 1 + 3, dict(wp.requests))
+
+    # A site without /batch/v1: the first batch call fails with 404 and everything is posted singly
+    wp.batch = False
+    wp.requests.clear()
+    jobs = [queued_job(base_url, 100 + k, f'Clerk {k}', 'Acme Ltd.') for k in range(4)]
+    run(script, wp, jobs)
+    check('fallback without batch route', script.wordpress.batch_supported is False and wp.requests['POST job-listings'] == 4, dict(wp.requests))
+    check('fallback jobs recorded', all(f'job-{100 + k}' in ledger.view('job_id') for k in range(4)))
+
+    server.shutdown()
+    if not args.keep:
+        os.chdir('/')
+        shutil.rmtree(workdir, ignore_errors=True)
+    else:
+        print(f'Working directory kept at {workdir}')
+    print('FAILED: ' + ', '.join(failures) if failures else 'All checks passed')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
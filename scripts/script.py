@@ -1,22 +1,38 @@
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml.cssselect import CSSSelector
 import base64
 import time
+import math
 import re
 import hashlib
+import sqlite3
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import nltk
 from requests.exceptions import RequestException
 import json
 import os
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import warnings
 import logging
+import functools
+import atexit
+import signal
+import sys
+import copy
+import unicodedata
+from collections import Counter, OrderedDict
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 from transformers import AutoTokenizer, AutoModelForCausalLM
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from transformers import LogitsProcessor, LogitsProcessorList, StoppingCriteria, StoppingCriteriaList
+from transformers.modeling_outputs import BaseModelOutput
 from sentence_transformers import SentenceTransformer, util
 import language_tool_python
 import torch
@@ -25,57 +41,303 @@ from huggingface_hub import login
 # Set CUDA_LAUNCH_BLOCKING for debugging
 os.environ["CUDA_LAUNCH_BLOCKING"] = "1"
 
-# Logging configuration
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s', filename='debug.log')
 logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
-logger.handlers = [h for h in logger.handlers if not isinstance(h, logging.StreamHandler)]
-file_handler = logging.FileHandler('debug.log')
-file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-logger.addHandler(file_handler)
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-logger.addHandler(console_handler)
-warnings.filterwarnings("ignore", category=requests.packages.urllib3.exceptions.InsecureRequestWarning)
 
-# Download NLTK punkt_tab and averaged_perceptron_tagger if not already present
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
-try:
-    nltk.data.find('taggers/averaged_perceptron_tagger')
-except LookupError:
-    nltk.download('averaged_perceptron_tagger')
+def configure_logging():
+    """Log everything to debug.log and INFO and up to the console; done when the script runs, not on import."""
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s', filename='debug.log')
+    logger.setLevel(logging.DEBUG)
+    logger.handlers = [h for h in logger.handlers if not isinstance(h, logging.StreamHandler)]
+    file_handler = logging.FileHandler('debug.log')
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger.addHandler(file_handler)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger.addHandler(console_handler)
 
-# Initialize language tool
-tool = language_tool_python.LanguageTool('en-US')
+warnings.filterwarnings("ignore", category=requests.packages.urllib3.exceptions.InsecureRequestWarning)
 
+# Heavy resources (JVM, models, NLTK data) and the on-disk stores are loaded on first use, so cycles
+# without new jobs stay cheap and importing the script (e.g. from benchmark_parsing.py) creates no files
+_RESOURCES = {}
+_RESOURCE_LOCK = threading.Lock()
+RESOURCE_LOAD_SECONDS = {}
+
+def _lazy_resource(name, loader):
+    """Return the named resource, loading and timing it on first use."""
+    resource = _RESOURCES.get(name)
+    if resource is None:
+        with _RESOURCE_LOCK:
+            resource = _RESOURCES.get(name)
+            if resource is None:
+                start = time.time()
+                resource = loader()
+                RESOURCE_LOAD_SECONDS[name] = time.time() - start
+                logger.info(f"Loaded {name} in {RESOURCE_LOAD_SECONDS[name]:.1f}s")
+                _RESOURCES[name] = resource
+    return resource
+
+def _download_nltk_data():
+    # Download NLTK punkt_tab and averaged_perceptron_tagger if not already present
+    try:
+        nltk.data.find('tokenizers/punkt_tab')
+    except LookupError:
+        nltk.download('punkt_tab')
+    try:
+        nltk.data.find('taggers/averaged_perceptron_tagger')
+    except LookupError:
+        nltk.download('averaged_perceptron_tagger')
+    return True
+
+def ensure_nltk_data():
+    return _lazy_resource("NLTK data", _download_nltk_data)
+
+# LanguageTool servers: LANGUAGETOOL_POOL_SIZE embedded servers, or already running local servers by URL
+LANGUAGETOOL_POOL_SIZE = int(os.environ.get("LANGUAGETOOL_POOL_SIZE", "1"))
+LANGUAGETOOL_SERVERS = [url.strip() for url in os.environ.get("LANGUAGETOOL_SERVERS", "").split(",") if url.strip()]
+
+class LanguageToolPool:
+    """Spreads LanguageTool checks over several servers, restarting any that fail.
+
+    check() borrows an idle server for the duration of one request, so concurrent
+    paraphrase workers check in parallel instead of queueing on a single JVM.
+    """
+
+    def __init__(self, size=LANGUAGETOOL_POOL_SIZE, servers=LANGUAGETOOL_SERVERS):
+        self.servers = servers
+        self.size = len(servers) if servers else max(1, size)
+        self.idle = queue.Queue()
+        self.restarts = 0
+        with ThreadPoolExecutor(max_workers=self.size) as pool:
+            for slot, instance in enumerate(pool.map(self._start, range(self.size))):
+                self.idle.put((slot, instance))
+
+    def _start(self, slot):
+        if self.servers:
+            return language_tool_python.LanguageTool('en-US', remote_server=self.servers[slot])
+        return language_tool_python.LanguageTool('en-US')
+
+    def _restart(self, slot, instance):
+        try:
+            instance.close()
+        except Exception:
+            pass
+        self.restarts += 1
+        return self._start(slot)
+
+    def check(self, text):
+        slot, instance = self.idle.get()
+        try:
+            try:
+                return instance.check(text)
+            except Exception as e:
+                logger.warning(f"LanguageTool server {slot + 1} failed ({str(e)}). Restarting it and retrying.")
+                instance = self._restart(slot, instance)
+                return instance.check(text)
+        finally:
+            self.idle.put((slot, instance))
+
+    def health_check(self):
+        """Check every server with a short request, restarting those that do not answer."""
+        for _ in range(self.size):
+            slot, instance = self.idle.get()
+            try:
+                instance.check("This is a health check.")
+            except Exception as e:
+                logger.warning(f"LanguageTool server {slot + 1} failed its health check ({str(e)}). Restarting it.")
+                try:
+                    instance = self._restart(slot, instance)
+                except Exception as restart_error:
+                    logger.error(f"Could not restart LanguageTool server {slot + 1}: {str(restart_error)}")
+            finally:
+                self.idle.put((slot, instance))
+
+    def close(self):
+        while not self.idle.empty():
+            _, instance = self.idle.get()
+            try:
+                instance.close()
+            except Exception:
+                pass
+
+def get_tool():
+    return _lazy_resource("LanguageTool", LanguageToolPool)
+
+
+# Inference backend: "torch" (fp32), "int8" (dynamic int8 quantization), "onnx" or "onnx-int8" (ONNX Runtime)
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "torch")
+MODEL_CACHE_DIR = os.environ.get("MODEL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "mimusjobs-models"))
+ONNX_BACKENDS = ("onnx", "onnx-int8")
+
+def _quantize_onnx_model(model_dir):
+    """Quantize every exported ONNX graph in model_dir to dynamic int8, next to the fp32 files."""
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    for file_name in sorted(os.listdir(model_dir)):
+        if file_name.endswith(".onnx") and not file_name.endswith("_quantized.onnx"):
+            quantizer = ORTQuantizer.from_pretrained(model_dir, file_name=file_name)
+            quantizer.quantize(save_dir=model_dir, quantization_config=qconfig)
+            logger.info(f"Quantized {file_name} to int8 in {model_dir}")
+
+def _load_onnx_generation_model(model_name, backend):
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    model_dir = os.path.join(MODEL_CACHE_DIR, f"{model_name.replace('/', '--')}-onnx")
+    if not os.path.exists(os.path.join(model_dir, "encoder_model.onnx")):
+        logger.info(f"Exporting {model_name} to ONNX with KV cache in {model_dir}")
+        ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True).save_pretrained(model_dir)
+    if backend != "onnx-int8":
+        return ORTModelForSeq2SeqLM.from_pretrained(model_dir, use_cache=True)
+    if not os.path.exists(os.path.join(model_dir, "encoder_model_quantized.onnx")):
+        _quantize_onnx_model(model_dir)
+    decoder_file_name = "decoder_model_quantized.onnx"
+    if not os.path.exists(os.path.join(model_dir, decoder_file_name)):
+        decoder_file_name = "decoder_model_merged_quantized.onnx"
+    file_names = {"encoder_file_name": "encoder_model_quantized.onnx", "decoder_file_name": decoder_file_name}
+    if os.path.exists(os.path.join(model_dir, "decoder_with_past_model_quantized.onnx")):
+        file_names["decoder_with_past_file_name"] = "decoder_with_past_model_quantized.onnx"
+    return ORTModelForSeq2SeqLM.from_pretrained(model_dir, use_cache=True, **file_names)
+
+def _load_int8_generation_model(model_name):
+    model_path = os.path.join(MODEL_CACHE_DIR, f"{model_name.replace('/', '--')}-int8.pt")
+    if os.path.exists(model_path):
+        try:
+            return torch.load(model_path, weights_only=False)
+        except Exception as e:
+            logger.warning(f"Could not load cached int8 model {model_path}: {str(e)}. Re-quantizing.")
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    torch.save(model, model_path + ".tmp")
+    os.replace(model_path + ".tmp", model_path)
+    logger.info(f"Cached int8 quantized {model_name} at {model_path}")
+    return model
+
+def load_generation_model(model_name, backend=INFERENCE_BACKEND):
+    """Load the seq2seq paraphrase model for the selected CPU inference backend.
+
+    Converted artifacts (int8 weights, ONNX exports) are cached under MODEL_CACHE_DIR,
+    so only the first run on a machine pays for the conversion.
+    """
+    if backend in ONNX_BACKENDS:
+        try:
+            return _load_onnx_generation_model(model_name, backend)
+        except ImportError as e:
+            logger.error(f"ONNX Runtime backend unavailable ({str(e)}). Install optimum[onnxruntime]; falling back to torch.")
+            backend = "torch"
+    if backend == "int8":
+        model = _load_int8_generation_model(model_name)
+    else:
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    model.to(device)
+    return model
+
+def load_similarity_model(model_name, backend=INFERENCE_BACKEND):
+    """Load the sentence-embedding model for the selected CPU inference backend."""
+    if backend in ONNX_BACKENDS:
+        # The hub repo ships pre-quantized ONNX graphs alongside the fp32 export.
+        model_kwargs = {"file_name": "onnx/model_qint8_avx2.onnx"} if backend == "onnx-int8" else None
+        try:
+            return SentenceTransformer(model_name, device='cpu', backend='onnx', cache_folder=MODEL_CACHE_DIR, model_kwargs=model_kwargs)
+        except Exception as e:
+            logger.error(f"Could not load ONNX similarity model ({str(e)}). Falling back to torch.")
+    similarity_model = SentenceTransformer(model_name, device='cpu')
+    if backend == "int8":
+        similarity_model = torch.quantization.quantize_dynamic(similarity_model, {torch.nn.Linear}, dtype=torch.qint8)
+    return similarity_model
 
-# Initialize model and tokenizer
 device = torch.device("cpu")  # Always CPU
 model_name = "google/flan-t5-large"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-#model = AutoModelForCausalLM.from_pretrained(model_name)
-model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-model.eval()
-model.to(device)
+similarity_model_name = 'all-MiniLM-L6-v2'
+
+def get_tokenizer():
+    return _lazy_resource(f"{model_name} tokenizer", lambda: AutoTokenizer.from_pretrained(model_name))
 
-# Initialize sentence transformer on CPU
-similarity_model = SentenceTransformer('all-MiniLM-L6-v2', device='cpu')
+def get_model():
+    return _lazy_resource(f"{model_name} ({INFERENCE_BACKEND} backend)", lambda: load_generation_model(model_name))
+
+def get_similarity_model():
+    return _lazy_resource(f"{similarity_model_name} ({INFERENCE_BACKEND} backend)", lambda: load_similarity_model(similarity_model_name))
+
+def warm_up_models():
+    """Load everything paraphrasing needs up front, once a page is known to have new jobs."""
+    start = time.time()
+    ensure_nltk_data()
+    get_tool().health_check()
+    get_tokenizer()
+    get_model()
+    get_similarity_model()
+    logger.info(f"Paraphrase models ready after {time.time() - start:.1f}s")
 
 # Constants
 MAX_TOTAL_TOKENS = 3000
 MAX_RETURN_SEQUENCES = 4
-WP_URL = "https://kenya.mimusjobs.com/wp-json/wp/v2/job-listings"
-WP_COMPANY_URL = "https://kenya.mimusjobs.com/wp-json/wp/v2/company"
-WP_MEDIA_URL = "https://kenya.mimusjobs.com/wp-json/wp/v2/media"
+GENERATION_BATCH_SIZE = int(os.environ.get("GENERATION_BATCH_SIZE", "8"))  # max prompt x temperature rows per model.generate call
+GENERATION_MAX_BATCH_TOKENS = int(os.environ.get("GENERATION_MAX_BATCH_TOKENS", "4096"))  # max padded prompt tokens per batch
+GENERATION_BUCKET_RATIO = 1.5  # longest prompt in a batch may be at most this many times the shortest
+ENCODER_CACHE_SIZE = int(os.environ.get("ENCODER_CACHE_SIZE", "256"))  # prompts whose encoder states are kept for retries
+PARAPHRASE_WORKERS = int(os.environ.get("PARAPHRASE_WORKERS", "1"))  # threads sharing the paraphrase tasks of a page; torch threads are split between them
+SIMILARITY_CACHE_SIZE = 1024  # original texts whose sentence embeddings are kept
+GRAMMAR_CACHE_SIZE = 4096  # texts whose LanguageTool results are kept
+INPUT_PROFILE_CACHE_SIZE = 512  # titles, descriptions and taglines whose noun/capitalization data is kept
+LENGTH_AWARE_DECODING = os.environ.get("LENGTH_AWARE_DECODING", "1") != "0"  # size paragraph budgets from the input length
+RUNAWAY_WORD_SLACK = 1.5  # a paragraph sample is stopped, and trimmed, once it runs past max_wc times this
+OUTPUT_TOKEN_MARGIN = 16  # extra decode steps on top of the length-aware budget
+FIELD_TIME_BUDGETS = {  # seconds of paraphrasing each field of a job may take before retries stop
+    "title": 120,
+    "job description": 300,
+    "company details": 300,
+    "tagline": 90,
+}
+WP_BASE_URL = os.environ.get("WP_BASE_URL", "https://kenya.mimusjobs.com").rstrip("/")  # site every WordPress call goes to
+WP_URL = f"{WP_BASE_URL}/wp-json/wp/v2/job-listings"
+WP_COMPANY_URL = f"{WP_BASE_URL}/wp-json/wp/v2/company"
+WP_MEDIA_URL = f"{WP_BASE_URL}/wp-json/wp/v2/media"
+WP_BATCH_URL = f"{WP_BASE_URL}/wp-json/batch/v1"
+WP_BATCH_MAX = int(os.environ.get("WP_BATCH_MAX", "25"))  # sub-requests per /batch/v1 call (WordPress rejects more than 25 by default)
+WP_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # upper bounds (seconds) of the WordPress latency histogram
+WP_REGION_URL = f"{WP_BASE_URL}/wp-json/wp/v2/job_listing_region"
+WP_JOB_TYPE_URL = f"{WP_BASE_URL}/wp-json/wp/v2/job_listing_type"
 WP_USERNAME = "admin"
 WP_APP_PASSWORD = "Xljs I1VY 7XL0 F45N 3Wsv 5qcv"
+SCRAPE_WORKERS = int(os.environ.get("SCRAPE_WORKERS", "8"))  # job pages fetched concurrently
+SCRAPE_PER_HOST_CONCURRENCY = int(os.environ.get("SCRAPE_PER_HOST_CONCURRENCY", "4"))  # open requests allowed per host
+HOST_RATE_LIMITS = {
+    "www.myjobmag.co.ke": float(os.environ.get("MYJOBMAG_RATE_LIMIT", "4")),  # requests per second to the job board
+    urlparse(WP_BASE_URL).netloc: float(os.environ.get("WORDPRESS_RATE_LIMIT", "2")),  # requests per second to WordPress
+}
+DEFAULT_HOST_RATE_LIMIT = float(os.environ.get("DEFAULT_HOST_RATE_LIMIT", "8"))  # requests per second to any other host
+RATE_LIMIT_BURST = int(os.environ.get("RATE_LIMIT_BURST", "4"))  # requests a host may receive back to back
+RATE_LIMIT_BACKOFF = float(os.environ.get("RATE_LIMIT_BACKOFF", "10"))  # first pause after a 429/503 without Retry-After
+RATE_LIMIT_RETRIES = int(os.environ.get("RATE_LIMIT_RETRIES", "3"))  # times a throttled request is re-sent
+CYCLE_POLL_MIN = int(os.environ.get("CYCLE_POLL_MIN", "300"))  # first wait before checking page 1 for new listings
+CYCLE_POLL_MAX = int(os.environ.get("CYCLE_POLL_MAX", "1800"))  # longest wait between page 1 checks
+CYCLE_MAX_WAIT = int(os.environ.get("CYCLE_MAX_WAIT", "7200"))  # start the next cycle after this long even without new listings
+COMPANY_CACHE_TTL = int(os.environ.get("COMPANY_CACHE_TTL", "21600"))  # seconds a parsed company page is reused without revalidating
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", "16"))  # jobs buffered between pipeline stages
+STAGE_STOP_SECONDS = float(os.environ.get("STAGE_STOP_SECONDS", "5"))  # how long a stopping run waits for the stages' jobs in hand
+PARAPHRASE_BATCH_JOBS = int(os.environ.get("PARAPHRASE_BATCH_JOBS", "8"))  # queued jobs paraphrased in one batched pass
+PUBLISH_BATCH_JOBS = int(os.environ.get("PUBLISH_BATCH_JOBS", "0"))  # queued jobs published in one /batch/v1 round; 0 posts them one at a time
 PROCESSED_IDS_FILE = "kenya_processed_job_ids.csv"
+PROCESSED_JOBS_DB = "processed_jobs.db"
+LEDGER_COMMIT_ROWS = int(os.environ.get("LEDGER_COMMIT_ROWS", "16"))  # processed jobs buffered before a commit
+SEEN_FILTER_ERROR_RATE = float(os.environ.get("SEEN_FILTER_ERROR_RATE", "0.001"))  # Bloom filter false-positive target before the exact ledger check
+SEEN_FILTER_CAPACITY = int(os.environ.get("SEEN_FILTER_CAPACITY", "20000"))  # entries in the first Bloom filter slice; later slices grow 4x
+LEDGER_COMMIT_SECONDS = float(os.environ.get("LEDGER_COMMIT_SECONDS", "5"))  # longest a processed job stays uncommitted
 LAST_PAGE_FILE = "last_processed_page.txt"
+PARAPHRASE_CACHE_FILE = "paraphrase_cache.db"
+PARAPHRASE_CACHE_MAX_ENTRIES = int(os.environ.get("PARAPHRASE_CACHE_MAX_ENTRIES", "20000"))
+URL_CACHE_FILE = "url_cache.db"
+URL_CACHE_TTL = int(os.environ.get("URL_CACHE_TTL", "604800"))  # seconds a resolved application/company URL is reused
+URL_CACHE_FAILURE_TTL = int(os.environ.get("URL_CACHE_FAILURE_TTL", "3600"))  # seconds an unresolvable URL is not retried
+TRACKING_PARAMS = frozenset(p.strip() for p in os.environ.get(
+    "TRACKING_PARAMS",
+    "utm_source,utm_medium,utm_campaign,utm_term,utm_content,utm_id,gclid,fbclid,msclkid,yclid,mc_cid,mc_eid,_hsenc,_hsmi,igshid"
+).split(",") if p.strip())  # query parameters stripped from resolved URLs
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.93 Safari/537.36'
 }
@@ -88,6 +350,94 @@ JOB_TYPE_MAPPING = {
     "Internship": "internship",
     "Volunteer": "volunteer"
 }
+DESCRIPTION_PROMPT_PHRASES = [
+    "Rephrase the following job description paragraph",
+    "Rephrase the job description",
+    "Paragraph professionally, preserving all key details",
+    "Rewrite the following",
+    "Rephrase the paragraph below",
+    "Rephrase the following job description",
+    "Preserving all key details",
+    "Tone and structure",
+    "Keep the length approximately the same",
+    "Job description paragraph professionally",
+    "Paraphrase", "Paraphrased", "Paraphrase the following",
+    "Paraphrase the job description", "Paraphrasing",
+    "Job description", "Job description paragraph",
+]
+COMPANY_PROMPT_PHRASES = [
+    "Rephrase the following company details paragraph",
+    "Rephrase the company details",
+    "Paragraph professionally, preserving all key details",
+    "Rewrite the following",
+    "Rephrase the paragraph below",
+    "Rephrase the following company details",
+    "Preserving all key details",
+    "Tone and structure",
+    "Keep the length approximately the same",
+    "Do your company information paragraph need improvements",
+    "Paraphrase", "Paraphrased", "Paraphrasing", "Paragraph", "Company details",
+]
+TITLE_BANNED_PHRASES = [
+    "Rewrite the following", "Paraphrased title", "Professionally rewrite",
+    "Keep it short", "Use different phrasing", "Short (5–12 words)",
+    "Paraphrase", "Paraphrased", "Paraphrasing", "Paraphrased version",
+    "Summary", "Summarised", "Summarized", "Summarizing", "Summarising","None.","None","none",
+    ".",":"
+]
+TAGLINE_REJECTED_PHRASES = [
+    "Paraphrased tagline", "Rewrite the following", "Original tagline",
+    "Professionally rewritten", "Crisp and impactful", "Summary:",
+    "Short and professional", "Keep it short", "###", "Tagline:",
+    "Output:", "Company summary", "Paraphrased version", "Rephrased version",
+    "Paraphrase", "Paraphrased", "Paraphrasing", "Summarized", "Summarised",
+    "Summarizing", "Summarising", "Summary"
+]
+
+
+class PhraseMatcher:
+    """Finds any of a fixed set of phrases, case-insensitively, with one compiled alternation."""
+
+    def __init__(self, phrases, context=20):
+        self.context = context
+        self.phrases = {phrase.lower(): phrase for phrase in reversed(phrases)}
+        # Longest first, so the reported phrase is the most specific one at a position.
+        alternatives = sorted(self.phrases, key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(phrase) for phrase in alternatives), re.IGNORECASE)
+
+    def search(self, text):
+        """Return (True, phrase, context snippet) for the first phrase in text, or (False, None, None)."""
+        match = self.pattern.search(text)
+        if not match:
+            return False, None, None
+        context_start = max(0, match.start() - self.context)
+        context_end = min(len(text), match.end() + self.context)
+        context_snippet = text[context_start:context_end]
+        if context_start > 0:
+            context_snippet = "..." + context_snippet
+        if context_end < len(text):
+            context_snippet = context_snippet + "..."
+        return True, self.phrases[match.group(0).lower()], context_snippet
+
+
+DESCRIPTION_PROMPT_MATCHER = PhraseMatcher(DESCRIPTION_PROMPT_PHRASES)
+COMPANY_PROMPT_MATCHER = PhraseMatcher(COMPANY_PROMPT_PHRASES)
+TITLE_BANNED_MATCHER = PhraseMatcher(TITLE_BANNED_PHRASES)
+TAGLINE_REJECTED_MATCHER = PhraseMatcher(TAGLINE_REJECTED_PHRASES)
+
+# Precompiled text clean-up passes for sanitize_text and normalize_paraphrase
+HEADING_MARKS_RE = re.compile(r'#+\s*')
+UNPRINTABLE_RE = re.compile(r'\*\*|[^\x20-\x7E\n\u00C0-\u017F]+')
+CONTROL_CHARS_RE = re.compile(r'[\r\t\f\v]+')
+SPACES_RE = re.compile(r'[ \t]+')
+BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n+')
+VERBOSE_OUTPUT_RE = re.compile(
+    r'Paraphrased Version'
+    r'|Paraphrased Job Description for'
+    r'|This paraphrased version maintains the original content while improving clarity and readability\.',
+    re.IGNORECASE
+)
+MARKUP_RE = re.compile(r'\*\*|[\r\f\v]+')
 
 def sanitize_text(text, is_url=False, is_email=False):
     """Sanitize input text by removing unwanted characters and normalizing."""
@@ -97,47 +447,146 @@ def sanitize_text(text, is_url=False, is_email=False):
     if not text:
         return ""
     if is_url or is_email:
-        text = re.sub(r'[\r\t\f\v]', '', text)
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        text = re.sub(r'[ \t]+', ' ', text).strip()
-        return text
-    text = re.sub(r'#+\s*', '', text)
-    text = re.sub(r'\*\*', '', text)
-    text = re.sub(r'—+', '', text)
-    text = re.sub(r'←+', '', text)
-    text = re.sub(r'[^\x20-\x7E\n\u00C0-\u017F]', '', text)
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text).strip()
-    return text
+        text = CONTROL_CHARS_RE.sub('', text)
+        text = BLANK_LINES_RE.sub('\n\n', text)
+        return SPACES_RE.sub(' ', text).strip()
+    text = HEADING_MARKS_RE.sub('', text)
+    # Drops "**" and everything unprintable (including dashes and arrows) in one pass
+    text = UNPRINTABLE_RE.sub('', text)
+    text = SPACES_RE.sub(' ', text)
+    return BLANK_LINES_RE.sub('\n\n', text).strip()
+
+class GrammarService:
+    """LanguageTool checks, memoized, with uncached texts checked concurrently.
+
+    A check yields the corrected text and the number of issues LanguageTool found. Each
+    text gets its own request: joined texts would let LanguageTool's cross-sentence and
+    paragraph rules match in one text because of its neighbour, making a text's memoized
+    count depend on the batch it happened to arrive in. The server pool supplies the
+    concurrency instead.
+    """
+
+    def __init__(self, cache_size=GRAMMAR_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+
+    @staticmethod
+    def _key(text):
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _remember(self, text, result):
+        with self.lock:
+            self.cache[self._key(text)] = result
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def check(self, text):
+        """Return (corrected text, issue count) for text."""
+        return self.check_many([text])[0]
+
+    def check_many(self, texts):
+        """Return (corrected text, issue count) for every text, checking the uncached ones in parallel."""
+        results = [None] * len(texts)
+        missing = {}
+        with self.lock:
+            for i, text in enumerate(texts):
+                key = self._key(text)
+                if key in self.cache:
+                    self.cache.move_to_end(key)
+                    results[i] = self.cache[key]
+                    self.hits += 1
+                else:
+                    missing.setdefault(text, []).append(i)
+            self.misses += len(missing)
+        if missing:
+            if len(missing) == 1:
+                checked = [self._check_one(text) for text in missing]
+            else:
+                with ThreadPoolExecutor(max_workers=min(len(missing), len(LANGUAGETOOL_SERVERS) or max(1, LANGUAGETOOL_POOL_SIZE))) as pool:
+                    checked = list(pool.map(self._check_one, missing))
+            for text, result in zip(missing, checked):
+                for i in missing[text]:
+                    results[i] = result
+        return results
+
+    def _check_one(self, text):
+        try:
+            with self.lock:
+                self.requests += 1
+            matches = get_tool().check(text)
+        except Exception as e:
+            logger.error(f"Error in grammar check: {str(e)}")
+            return (text, 0)
+        result = (language_tool_python.utils.correct(text, matches), len(matches))
+        self._remember(text, result)
+        return result
+
+    def log_stats(self):
+        pool = _RESOURCES.get("LanguageTool")
+        restarts = f", {pool.restarts} server restarts" if pool else ""
+        logger.info(f"Grammar service: {self.requests} LanguageTool requests, memo {self.hits} hits / {self.misses} misses{restarts}")
+
+grammar_service = GrammarService()
+
+class SimilarityScorer:
+    """Scores paraphrase candidates against their original text in one embedding batch.
+
+    Embeddings of originals are kept in a bounded LRU, so a paragraph is embedded once
+    no matter how many attempts its candidates go through. Shared by paraphrase worker threads.
+    """
+
+    def __init__(self, cache_size=SIMILARITY_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.encode_lock = threading.Lock()  # the embedding model's fast tokenizer is not thread-safe either
+
+    def _encode(self, texts):
+        with self.encode_lock:
+            return get_similarity_model().encode(texts, convert_to_tensor=True)
+
+    def _original_embedding(self, original):
+        with self.lock:
+            if original in self.cache:
+                self.cache.move_to_end(original)
+                return self.cache[original]
+        embedding = self._encode([original])[0]
+        with self.lock:
+            self.cache[original] = embedding
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return embedding
+
+    def score(self, original, candidates):
+        """Return the cosine similarity of every candidate to original, in order."""
+        if not candidates:
+            return []
+        try:
+            original_embedding = self._original_embedding(original)
+            candidate_embeddings = self._encode(candidates)
+            return util.cos_sim(original_embedding, candidate_embeddings)[0].tolist()
+        except Exception as e:
+            logger.error(f"Error computing similarity: {str(e)}")
+            return [0.0] * len(candidates)
 
-def clean_description(text):
-    """Clean paraphrased text using LanguageTool for grammar and style."""
-    try:
-        matches = tool.check(text)
-        corrected_text = language_tool_python.utils.correct(text, matches)
-        return corrected_text
-    except Exception as e:
-        logger.error(f"Error in grammar correction: {str(e)}")
-        return text
+similarity_scorer = SimilarityScorer()
 
 def is_good_paraphrase(original: str, candidate: str) -> float:
     """Calculate cosine similarity between original and paraphrased text."""
-    try:
-        embeddings = similarity_model.encode([original, candidate], convert_to_tensor=True)
-        sim_score = util.pytorch_cos_sim(embeddings[0], embeddings[1]).item()
-        return sim_score
-    except Exception as e:
-        logger.error(f"Error computing similarity: {str(e)}")
-        return 0.0
+    return similarity_scorer.score(original, [candidate])[0]
 
 def is_grammatically_correct(text):
     """Check if text is grammatically correct with minimal issues."""
-    matches = tool.check(text)
-    return len(matches) < 3
+    return grammar_service.check(text)[1] < 3
 
 def extract_nouns(text):
     """Extract nouns (NN, NNS, NNP, NNPS) from text using NLTK POS tagging."""
     try:
+        ensure_nltk_data()
         tokens = nltk.word_tokenize(text)
         tagged = nltk.pos_tag(tokens)
         nouns = [word for word, pos in tagged if pos in ['NN', 'NNS', 'NNP', 'NNPS']]
@@ -146,14 +595,6 @@ def extract_nouns(text):
         logger.error(f"Error extracting nouns from {text}: {str(e)}")
         return []
 
-def contains_nouns(paraphrase, required_nouns):
-    """Check if the paraphrase contains all required nouns."""
-    if not required_nouns:
-        return True
-    paraphrase_lower = paraphrase.lower()
-    return all(noun.lower() in paraphrase_lower for noun in required_nouns)
-
-
 def extract_capitalized_words(text):
     """Extract words with specific capitalization (e.g., proper nouns, acronyms) from the input text."""
     import re
@@ -161,18 +602,578 @@ def extract_capitalized_words(text):
     # Filter out common words that shouldn't be enforced (e.g., sentence starters may need adjustment)
     return {word: word for word in words if len(word) > 1}  # Dictionary to map lowercase to original case
 
-def restore_capitalization(paraphrased, capitalized_words):
-    """Restore original capitalization of specified words in the paraphrased text."""
-    paraphrased_lower = paraphrased.lower()
-    result = paraphrased
-    for lower_word, orig_word in capitalized_words.items():
-        # Replace case-insensitive occurrences with the original capitalized form
-        pattern = r'\b' + re.escape(lower_word) + r'\b'
-        result = re.sub(pattern, orig_word, result, flags=re.IGNORECASE)
-    return result
+WORD_TOKEN_RE = re.compile(r"[\w'-]+")
+
+class InputProfile:
+    """What every paraphrase candidate of one input is checked against, computed once.
+
+    Holds the input's required nouns (as a set, with a token-membership fast path) and a
+    single compiled pattern that restores the input's capitalized words in a candidate.
+    """
+
+    def __init__(self, text, with_nouns=False):
+        self.nouns = extract_nouns(text) if with_nouns else []
+        self.required_nouns = frozenset(noun.lower() for noun in self.nouns)
+        self.capitalized_words = extract_capitalized_words(text)
+        # Later spellings of the same word win, as they did with one re.sub per word.
+        self.replacements = {word.lower(): word for word in self.capitalized_words}
+        alternatives = sorted(self.replacements, key=len, reverse=True)
+        self.capitalization_re = (
+            re.compile(r'\b(?:' + "|".join(re.escape(word) for word in alternatives) + r')\b', re.IGNORECASE)
+            if alternatives else None
+        )
 
+    def restore_capitalization(self, paraphrased):
+        """Restore original capitalization of the input's capitalized words in the paraphrased text."""
+        if self.capitalization_re is None:
+            return paraphrased
+        return self.capitalization_re.sub(lambda m: self.replacements[m.group(0).lower()], paraphrased)
+
+    def contains_nouns(self, paraphrase):
+        """Check if the paraphrase contains all required nouns."""
+        if not self.required_nouns:
+            return True
+        paraphrase_lower = paraphrase.lower()
+        tokens = set(WORD_TOKEN_RE.findall(paraphrase_lower))
+        # Whole-word hits are settled by the token set; anything else falls back to a substring scan.
+        return all(noun in tokens or noun in paraphrase_lower for noun in self.required_nouns)
+
+
+@functools.lru_cache(maxsize=INPUT_PROFILE_CACHE_SIZE)
+def input_profile(text, with_nouns=False):
+    return InputProfile(text, with_nouns)
+
+
+# Every call into the shared fast tokenizer goes through this lock: it refuses concurrent
+# truncation/padding changes ("Already borrowed") when paraphrase workers overlap.
+TOKENIZER_LOCK = threading.Lock()
+
+def encode_text(text, **kwargs):
+    """tokenizer.encode behind TOKENIZER_LOCK."""
+    tokenizer = get_tokenizer()
+    with TOKENIZER_LOCK:
+        return tokenizer.encode(text, **kwargs)
+
+
+class GenerationRequest:
+    """A prompt waiting to be sampled, plus the model.generate settings it needs.
+
+    Every temperature in `temperatures` is decoded from the same encoder pass, and the
+    caller receives one list of decoded outputs per temperature, in order. Samples that
+    run past `max_words` are stopped early and returned trimmed to `max_words` words, so
+    they can still serve as a best-score fallback. `seconds` is this request's share of
+    the batches it was generated in.
+    """
+
+    def __init__(self, prompt, max_new_tokens, temperatures=(1.0,), max_length=MAX_TOTAL_TOKENS, max_words=None, **generate_kwargs):
+        self.prompt = prompt
+        self.max_new_tokens = max_new_tokens
+        self.max_words = max_words
+        self.temperatures = list(temperatures)
+        self.max_length = max_length
+        self.generate_kwargs = generate_kwargs
+        self.input_ids = None
+        self.seconds = 0.0
+
+    def batch_key(self):
+        """Requests can only share a model.generate call when their sampling settings match."""
+        return tuple(sorted(self.generate_kwargs.items()))
+
+
+class RowTemperatureLogitsWarper(LogitsProcessor):
+    """Applies a different sampling temperature to each row of the batch."""
+
+    def __init__(self, temperatures):
+        self.temperatures = temperatures
+
+    def __call__(self, input_ids, scores):
+        return scores / self.temperatures.to(scores.dtype)[:, None]
+
+
+class RowLimitStoppingCriteria(StoppingCriteria):
+    """Stops each row at its own max_new_tokens, or as soon as it runs past its word limit.
+
+    Words are counted as tokens that open a new word ("▁" pieces in SentencePiece vocabularies).
+    """
+
+    def __init__(self, max_new_tokens, max_words, word_starts):
+        self.max_new_tokens = max_new_tokens
+        self.max_words = max_words
+        self.word_starts = word_starts
+        self.words = torch.zeros_like(max_words)
+        self.runaway = torch.zeros_like(max_words, dtype=torch.bool)
+        self.steps = 0
+
+    def __call__(self, input_ids, scores, **kwargs):
+        self.steps += 1
+        self.words += self.word_starts[input_ids[:, -1]]
+        self.runaway |= self.words > self.max_words
+        return self.runaway | (self.steps >= self.max_new_tokens)
+
+
+class GenerationEngine:
+    """Samples many GenerationRequests together in padded, length-bucketed batches.
+
+    Encoder hidden states are cached per prompt, so retries of the same prompt only pay
+    for decoding.
+    """
+
+    def __init__(self, batch_size=GENERATION_BATCH_SIZE, max_batch_tokens=GENERATION_MAX_BATCH_TOKENS,
+                 bucket_ratio=GENERATION_BUCKET_RATIO, encoder_cache_size=ENCODER_CACHE_SIZE):
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.bucket_ratio = bucket_ratio
+        self.encoder_cache_size = encoder_cache_size
+        self.encoder_cache = OrderedDict()
+        self.batches_run = 0
+        self.prompts_run = 0
+        self.encoder_hits = 0
+        self.encoder_misses = 0
+        self.decode_steps = 0
+        self.wasted_steps = 0
+        self.runaway_rows = 0
+        self.word_starts = None
+
+    def absorb(self, other):
+        """Add the counters of a worker's engine to this one."""
+        self.batches_run += other.batches_run
+        self.prompts_run += other.prompts_run
+        self.encoder_hits += other.encoder_hits
+        self.encoder_misses += other.encoder_misses
+        self.decode_steps += other.decode_steps
+        self.wasted_steps += other.wasted_steps
+        self.runaway_rows += other.runaway_rows
+
+    def generate(self, requests):
+        """Sample every request, returning its decoded outputs (or the raised exception) per request, in order."""
+        results = [None] * len(requests)
+        groups = {}
+        for i, request in enumerate(requests):
+            if request.input_ids is None:
+                request.input_ids = encode_text(request.prompt, truncation=True, max_length=request.max_length)
+            groups.setdefault(request.batch_key(), []).append(i)
+        for indices in groups.values():
+            indices.sort(key=lambda i: len(requests[i].input_ids))
+            for bucket in self._buckets(requests, indices):
+                try:
+                    outputs = self._generate_bucket([requests[i] for i in bucket])
+                    for i, decoded in zip(bucket, outputs):
+                        results[i] = decoded
+                except Exception as e:
+                    logger.error(f"Error generating batch of {len(bucket)} prompts: {str(e)}")
+                    for i in bucket:
+                        results[i] = e
+        return results
+
+    def _buckets(self, requests, indices):
+        """Split length-sorted request indices into batches of similar prompt length."""
+        bucket = []
+        rows = 0
+        for i in indices:
+            length = len(requests[i].input_ids)
+            request_rows = len(requests[i].temperatures)
+            if bucket:
+                shortest = len(requests[bucket[0]].input_ids)
+                if (rows + request_rows > self.batch_size
+                        or (rows + request_rows) * length > self.max_batch_tokens
+                        or length > shortest * self.bucket_ratio):
+                    yield bucket
+                    bucket = []
+                    rows = 0
+            bucket.append(i)
+            rows += request_rows
+        if bucket:
+            yield bucket
+
+    def _encode(self, bucket):
+        """Return padded encoder hidden states and attention mask for the bucket, encoding only uncached prompts."""
+        keys = [tuple(r.input_ids) for r in bucket]
+        missing = [k for k in dict.fromkeys(keys) if k not in self.encoder_cache]
+        self.encoder_hits += len(keys) - len(missing)
+        self.encoder_misses += len(missing)
+        if missing:
+            with TOKENIZER_LOCK:
+                batch = get_tokenizer().pad({"input_ids": [list(k) for k in missing]}, padding=True, return_tensors="pt")
+            batch = batch.to(device)
+            model = get_model()
+            with torch.no_grad():
+                encoder = model.get_encoder() if hasattr(model, "get_encoder") else model.encoder
+                hidden = encoder(input_ids=batch['input_ids'], attention_mask=batch['attention_mask']).last_hidden_state
+            for j, key in enumerate(missing):
+                self.encoder_cache[key] = hidden[j, :len(key)].detach()
+        for key in keys:
+            self.encoder_cache.move_to_end(key)
+        states = [self.encoder_cache[key] for key in keys]
+        while len(self.encoder_cache) > self.encoder_cache_size:
+            self.encoder_cache.popitem(last=False)
+        max_len = max(state.shape[0] for state in states)
+        hidden = states[0].new_zeros((len(states), max_len, states[0].shape[-1]))
+        attention_mask = torch.zeros((len(states), max_len), dtype=torch.long, device=device)
+        for j, state in enumerate(states):
+            hidden[j, :state.shape[0]] = state
+            attention_mask[j, :state.shape[0]] = 1
+        return hidden, attention_mask
+
+    def _word_start_mask(self):
+        """Per-token flag telling whether the token starts a new word."""
+        if self.word_starts is None:
+            tokenizer = get_tokenizer()
+            with TOKENIZER_LOCK:
+                pieces = tokenizer.convert_ids_to_tokens(list(range(len(tokenizer))))
+            starts = [piece is not None and piece.startswith("▁") for piece in pieces]
+            if not any(starts):
+                starts = [piece is not None for piece in pieces]
+            for special_id in tokenizer.all_special_ids:
+                starts[special_id] = False
+            self.word_starts = torch.tensor(starts, dtype=torch.long, device=device)
+        return self.word_starts
+
+    def _generate_bucket(self, bucket):
+        generate_kwargs = bucket[0].generate_kwargs
+        num_return_sequences = generate_kwargs.get("num_return_sequences", 1)
+        start_time = time.time()
+        hidden, attention_mask = self._encode(bucket)
+        # One encoder row per (prompt, temperature) pair, so all retry temperatures decode together.
+        rows = torch.tensor([j for j, r in enumerate(bucket) for _ in r.temperatures], device=device)
+        temperatures = torch.tensor([t for r in bucket for t in r.temperatures], device=device)
+        # Buckets share one decode loop, so each sample is held to its own request's limits.
+        row_limits = RowLimitStoppingCriteria(
+            torch.tensor([r.max_new_tokens for r in bucket for _ in r.temperatures], device=device).repeat_interleave(num_return_sequences),
+            torch.tensor([r.max_words or MAX_TOTAL_TOKENS for r in bucket for _ in r.temperatures], device=device).repeat_interleave(num_return_sequences),
+            self._word_start_mask()
+        )
+        with torch.no_grad():
+            output = get_model().generate(
+                encoder_outputs=BaseModelOutput(last_hidden_state=hidden[rows]),
+                attention_mask=attention_mask[rows],
+                max_new_tokens=max(r.max_new_tokens for r in bucket),
+                logits_processor=LogitsProcessorList([
+                    RowTemperatureLogitsWarper(temperatures.repeat_interleave(num_return_sequences))
+                ]),
+                stopping_criteria=StoppingCriteriaList([row_limits]),
+                **generate_kwargs
+            )
+        tokenizer = get_tokenizer()
+        with TOKENIZER_LOCK:
+            decoded = [tokenizer.decode(seq, skip_special_tokens=True).strip() for seq in output]
+        runaway = row_limits.runaway.tolist()
+        # Split the batch's time between its requests by rows, for their fields' time budgets
+        elapsed = time.time() - start_time
+        for r in bucket:
+            r.seconds += elapsed * len(r.temperatures) / len(rows)
+
+        # Steps spent on padding after a sample finished are wasted.
+        steps = output.shape[1] - 1
+        used = (output[:, 1:] != tokenizer.pad_token_id).sum(dim=1)
+        wasted = steps * output.shape[0] - int(used.sum())
+        self.decode_steps += steps * output.shape[0]
+        self.wasted_steps += wasted
+        self.runaway_rows += sum(runaway)
+        self.batches_run += 1
+        self.prompts_run += len(bucket)
+        logger.debug(
+            f"Generated batch of {len(bucket)} prompts x {len(rows)} temperature rows x {num_return_sequences} sequences "
+            f"(padded to {hidden.shape[1]} tokens) in {time.time() - start_time:.1f}s: "
+            f"{steps} decode steps, {wasted}/{steps * output.shape[0]} row steps wasted, {sum(runaway)} runaway samples trimmed"
+        )
+        results = []
+        offset = 0
+        for r in bucket:
+            variants = []
+            for _ in r.temperatures:
+                variants.append([
+                    " ".join(text.split()[:r.max_words]) if cut else text
+                    for text, cut in zip(decoded[offset:offset + num_return_sequences], runaway[offset:offset + num_return_sequences])
+                ])
+                offset += num_return_sequences
+            results.append(variants)
+        return results
+
+    def log_stats(self):
+        logger.info(
+            f"Generation: {self.batches_run} batches, {self.prompts_run} prompts, "
+            f"encoder cache {self.encoder_hits} hits / {self.encoder_misses} misses, "
+            f"{self.wasted_steps}/{self.decode_steps} row decode steps wasted, {self.runaway_rows} runaway samples trimmed"
+        )
 
-def paraphrase_strict_title(title, max_attempts=3, max_sub_attempts=2):
+
+generation_engine = GenerationEngine()
+CANDIDATE_REJECTIONS = Counter()
+DEADLINE_STOPS = Counter()
+PARAPHRASE_STATS_LOCK = threading.Lock()  # guards the two counters above across paraphrase workers
+IDLE_SECONDS = Counter()
+
+
+def run_paraphrase_tasks(tasks, workers=PARAPHRASE_WORKERS):
+    """Drive paraphrase tasks together, batching the generation requests they yield.
+
+    Each task is a (generator, fallback) pair. The generator yields GenerationRequests,
+    receives the decoded outputs back (or has the generation error thrown into it) and
+    returns its final text. A task that fails outright resolves to its fallback.
+    With more than one worker the tasks are sharded across a thread pool.
+    """
+    if workers > 1 and len(tasks) > 1:
+        return _run_paraphrase_tasks_parallel(tasks, workers)
+    return _drive_paraphrase_tasks(tasks, generation_engine)
+
+
+def _run_paraphrase_tasks_parallel(tasks, workers):
+    """Run round-robin shards of the tasks on a bounded pool, splitting torch's threads between workers."""
+    workers = min(workers, len(tasks))
+    shards = [list(range(w, len(tasks), workers)) for w in range(workers)]
+    engines = [GenerationEngine() for _ in shards]
+    for engine in engines:
+        engine.word_starts = generation_engine._word_start_mask()
+    results = [fallback for _, fallback in tasks]
+    torch_threads = torch.get_num_threads()
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_drive_paraphrase_tasks, [tasks[i] for i in shard], engine)
+                for shard, engine in zip(shards, engines)
+            ]
+            for shard, future in zip(shards, futures):
+                try:
+                    for i, result in zip(shard, future.result()):
+                        results[i] = result
+                except Exception as e:
+                    logger.error(f"Paraphrase worker failed: {str(e)}. Falling back to original text for {len(shard)} tasks.")
+    finally:
+        torch.set_num_threads(torch_threads)
+        for engine in engines:
+            generation_engine.absorb(engine)
+    return results
+
+
+def _drive_paraphrase_tasks(tasks, engine):
+    results = [fallback for _, fallback in tasks]
+    pending = {}
+
+    def advance(i, outputs=None):
+        task = tasks[i][0]
+        try:
+            if isinstance(outputs, Exception):
+                pending[i] = task.throw(outputs)
+            else:
+                pending[i] = task.send(outputs)
+        except StopIteration as stop:
+            results[i] = stop.value
+        except Exception as e:
+            logger.error(f"Paraphrase task {i + 1} failed: {str(e)}. Falling back to original text.")
+
+    for i in range(len(tasks)):
+        advance(i)
+    while pending:
+        indices = list(pending)
+        requests = [pending.pop(i) for i in indices]
+        outputs = engine.generate(requests)
+        for i, output in zip(indices, outputs):
+            advance(i, output)
+    return results
+
+
+def run_task_groups(groups):
+    """Run several lists of paraphrase tasks in one batched pass, returning one result list per group."""
+    results = run_paraphrase_tasks([task for group in groups for task in group])
+    grouped = []
+    offset = 0
+    for group in groups:
+        grouped.append(results[offset:offset + len(group)])
+        offset += len(group)
+    return grouped
+
+
+class CandidateFilter:
+    """Runs decoded paraphrase candidates through rejection stages, cheapest first.
+
+    Every stage is a (name, check) pair whose check returns a rejection reason or None.
+    The string-only `cheap_stages` run first; only their survivors are grammar-corrected
+    by `correct` (re-running the cheap stages if the text changed) and then reach the
+    `expensive_stages`. Rejections are counted per stage, here and in CANDIDATE_REJECTIONS.
+    """
+
+    def __init__(self, field, prepare, cheap_stages, correct=None, expensive_stages=()):
+        self.field = field
+        self.prepare = prepare
+        self.cheap_stages = cheap_stages
+        self.correct = correct
+        self.expensive_stages = expensive_stages
+        self.seen = 0
+        self.passed = 0
+        self.rejections = Counter()
+
+    def _reject(self, stages, text):
+        for name, check in stages:
+            reason = check(text)
+            if reason:
+                self.rejections[name] += 1
+                with PARAPHRASE_STATS_LOCK:
+                    CANDIDATE_REJECTIONS[f"{self.field}/{name}"] += 1
+                logger.info(f"⛔ Rejected {self.field} candidate due to {reason}: \"{text}\"")
+                return True
+        return False
+
+    def run(self, decoded_outputs):
+        """Return (option index, cleaned text) for every candidate that survives all stages."""
+        candidates = []
+        for idx, d in enumerate(decoded_outputs):
+            self.seen += 1
+            text = self.prepare(d)
+            if not self._reject(self.cheap_stages, text):
+                candidates.append((idx, text))
+        if self.correct and candidates:
+            # Check the whole batch up front, spread over the server pool; `correct` then reads the memo.
+            grammar_service.check_many([text for _, text in candidates])
+        survivors = []
+        for idx, text in candidates:
+            if self.correct:
+                corrected = self.correct(text)
+                if corrected != text and self._reject(self.cheap_stages, corrected):
+                    continue
+                text = corrected
+            if self._reject(self.expensive_stages, text):
+                continue
+            self.passed += 1
+            survivors.append((idx, text))
+        return survivors
+
+    def log_summary(self):
+        logger.info(f"Candidate filter for {self.field}: {self.seen} seen, {self.passed} passed, rejected by stage: {dict(self.rejections)}")
+
+
+def log_candidate_filter_stats():
+    if CANDIDATE_REJECTIONS:
+        logger.info(f"Candidate rejections by stage this run: {dict(CANDIDATE_REJECTIONS.most_common())}")
+    if DEADLINE_STOPS:
+        logger.info(f"Paraphrase retries cut short by time budget: {dict(DEADLINE_STOPS)}")
+
+
+class FieldDeadline:
+    """Time budget for paraphrasing one field of a job.
+
+    Only the field's own work is charged: its requests' share of each generation batch and
+    the time spent checking their candidates, not other jobs batched alongside it. Tasks
+    stop retrying once a good candidate is found or the budget is spent, and settle for
+    their best candidate (or the original text) instead.
+    """
+
+    def __init__(self, field, seconds=None):
+        self.field = field
+        self.seconds = FIELD_TIME_BUDGETS.get(field, 300) if seconds is None else seconds
+        self.spent = 0.0
+        self.lock = threading.Lock()
+
+    def charge(self, seconds):
+        with self.lock:
+            self.spent += seconds
+
+    def expired(self, attempt):
+        """True once the budget is spent; the first attempt always runs."""
+        if attempt == 0 or self.spent < self.seconds:
+            return False
+        with PARAPHRASE_STATS_LOCK:
+            DEADLINE_STOPS[self.field] += 1
+        logger.info(f"⏱️ {self.field} time budget of {self.seconds}s spent ({self.spent:.0f}s) after {attempt} attempts")
+        return True
+
+
+def idle_sleep(seconds, reason):
+    """Sleep, booking the time against `reason` in the run's idle report."""
+    IDLE_SECONDS[reason] += seconds
+    time.sleep(seconds)
+
+
+def log_idle_stats(started):
+    elapsed = time.time() - started
+    idle = sum(IDLE_SECONDS.values())
+    logger.info(
+        f"Run time {elapsed:.0f}s, idle {idle:.0f}s ({100 * idle / max(elapsed, 1):.1f}%): "
+        f"{dict((reason, round(seconds)) for reason, seconds in IDLE_SECONDS.most_common())}"
+    )
+
+
+class ParaphraseCache:
+    """On-disk cache of accepted paraphrases, shared across runs through the workflow artifact.
+
+    Entries are keyed by a hash of the model id, the field and the whitespace-normalized
+    prompt (template plus sanitized input), so boilerplate paragraphs seen before skip
+    generation entirely. The table is capped at `max_entries`, evicting least recently used.
+    """
+
+    def __init__(self, path=PARAPHRASE_CACHE_FILE, max_entries=PARAPHRASE_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = None
+        try:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS paraphrases ("
+                "key TEXT PRIMARY KEY, field TEXT, paraphrase TEXT, similarity REAL, score REAL, "
+                "created_at REAL, last_used REAL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_paraphrases_last_used ON paraphrases (last_used)")
+            self.conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Paraphrase cache unavailable at {path}: {str(e)}")
+            self.conn = None
+
+    @staticmethod
+    def key(field, prompt):
+        normalized = " ".join(prompt.split())
+        return hashlib.sha256(f"{model_name}:{INFERENCE_BACKEND}\0{field}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached paraphrase for key, or None."""
+        if self.conn is None:
+            return None
+        with self.lock:
+            try:
+                row = self.conn.execute("SELECT paraphrase FROM paraphrases WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.hits += 1
+                self.conn.execute("UPDATE paraphrases SET last_used = ? WHERE key = ?", (time.time(), key))
+                self.conn.commit()
+                return row[0]
+            except sqlite3.Error as e:
+                logger.error(f"Paraphrase cache lookup failed: {str(e)}")
+                return None
+
+    def put(self, key, field, paraphrase, similarity, score):
+        if self.conn is None:
+            return
+        now = time.time()
+        with self.lock:
+            try:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO paraphrases (key, field, paraphrase, similarity, score, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, field, paraphrase, similarity, score, now, now)
+                )
+                count = self.conn.execute("SELECT COUNT(*) FROM paraphrases").fetchone()[0]
+                if count > self.max_entries:
+                    self.conn.execute(
+                        "DELETE FROM paraphrases WHERE key IN "
+                        "(SELECT key FROM paraphrases ORDER BY last_used ASC LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Paraphrase cache store failed: {str(e)}")
+
+    def log_stats(self):
+        logger.info(f"Paraphrase cache: {self.hits} hits, {self.misses} misses this run")
+
+def get_paraphrase_cache():
+    return _lazy_resource("paraphrase cache", ParaphraseCache)
+
+
+def _paraphrase_title_task(title, max_attempts=3, max_sub_attempts=2):
     def has_repetitions(text):
         tokens = text.lower().split()
         seen = set()
@@ -183,44 +1184,21 @@ def paraphrase_strict_title(title, max_attempts=3, max_sub_attempts=2):
             seen.add(ngram)
         return False
 
-    def contains_banned_phrase(text, banned_list):
-        text_lower = text.lower()
-        critical_phrases = [
-            "Rewrite the following", "Paraphrased title", "Professionally rewrite",
-            "Keep it short", "Use different phrasing", "Short (5–12 words)",
-            "Paraphrase", "Paraphrased", "Paraphrasing", "Paraphrased version",
-            "Summary", "Summarised", "Summarized", "Summarizing", "Summarising","None.","None","none",
-            ".",":"
-        ]
-        for phrase in critical_phrases:
-            if phrase.lower() in text_lower:
-                start_idx = text_lower.find(phrase.lower())
-                context_start = max(0, start_idx - 20)
-                context_end = min(len(text), start_idx + len(phrase) + 20)
-                context_snippet = text[context_start:context_end]
-                if context_start > 0:
-                    context_snippet = "..." + context_snippet
-                if context_end < len(text):
-                    context_snippet = context_snippet + "..."
-                return True, phrase, context_snippet
-        return False, None, None
-
-    def score_paraphrase(original, paraphrased, target_wc):
-        sim = is_good_paraphrase(original, paraphrased)
+    def score_paraphrase(sim, paraphrased, target_wc):
         wc = len(paraphrased.split())
         length_penalty = abs(wc - target_wc) / max(target_wc, 1)
-        return (sim + (1 - length_penalty)) / 2, sim, wc
+        return (sim + (1 - length_penalty)) / 2, wc
 
     clean_title = sanitize_text(title)
     if not clean_title:
         logger.error("Input title is empty after sanitization.")
         return title
 
-    nouns = extract_nouns(clean_title)
-    capitalized_words = extract_capitalized_words(clean_title)
+    profile = input_profile(clean_title, with_nouns=True)
+    nouns = profile.nouns
     nouns_str = ", ".join(nouns) if nouns else "none"
     logger.debug(f"Extracted nouns from title '{clean_title}': {nouns}")
-    logger.debug(f"Extracted capitalized words from title '{clean_title}': {list(capitalized_words.values())}")
+    logger.debug(f"Extracted capitalized words from title '{clean_title}': {list(profile.capitalized_words.values())}")
 
     prompt = (
         f"Rewrite the following job title professionally, using different phrasing while preserving the meaning. "
@@ -228,73 +1206,66 @@ def paraphrase_strict_title(title, max_attempts=3, max_sub_attempts=2):
         f"Preserve the following nouns exactly as they are: {nouns_str}.\n{clean_title}"
     )
 
-    encoding = tokenizer.encode_plus(
-        prompt,
-        return_tensors="pt",
-        truncation=True,
-        max_length=MAX_TOTAL_TOKENS
-    ).to(device)
-
+    # Titles stay out of paraphrase_cache: two jobs with the same title would get the same
+    # paraphrase, hence the same post slug, and the second would be skipped as a duplicate.
     available_output_tokens = 60
     target_word_count = len(clean_title.split())
     min_wc = max(1, int(target_word_count * 0.6))
     max_wc = min(12, int(target_word_count * 1.4))
 
+    def banned_reason(text):
+        is_banned, banned_phrase, context_snippet = TITLE_BANNED_MATCHER.search(text)
+        return f"banned phrase '{banned_phrase}' in context: '{context_snippet}'" if is_banned else None
+
+    candidate_filter = CandidateFilter(
+        "title",
+        prepare=lambda d: profile.restore_capitalization(normalize_paraphrase(d.replace(prompt, "").strip() if prompt in d else d.strip())),
+        cheap_stages=[
+            ("too_short", lambda text: "empty or too short" if not text or len(text.split()) < 1 else None),
+            ("banned_phrase", banned_reason),
+            ("repetitions", lambda text: "repeated phrases" if has_repetitions(text) else None),
+            ("nouns", lambda text: f"missing nouns (required: {nouns})" if not profile.contains_nouns(text) else None),
+        ],
+        correct=lambda text: profile.restore_capitalization(correct_grammar(text)),
+        expensive_stages=[
+            ("grammar", lambda text: "grammar" if not is_grammatically_correct(text) else None),
+        ]
+    )
+
     best_paraphrase = None
     best_score = -1
     best_attempt = ""
     best_metadata = ""
+    deadline = FieldDeadline("title")
 
     for attempt in range(max_attempts):
-        sub_attempt = 0
-        valid_paraphrase_found = False
+        if deadline.expired(attempt):
+            break
+        request = GenerationRequest(
+            prompt,
+            max_new_tokens=available_output_tokens,
+            temperatures=[0.8 + 0.1 * sub_attempt for sub_attempt in range(max_sub_attempts)],
+            do_sample=True,
+            top_k=40,
+            top_p=0.95,
+            repetition_penalty=1.2,
+            no_repeat_ngram_size=3,
+            num_return_sequences=MAX_RETURN_SEQUENCES
+        )
+        try:
+            variants = yield request
+        except Exception as e:
+            logger.error(f"Error during attempt {attempt + 1}: {str(e)}")
+            continue
+        deadline.charge(request.seconds)
+        checks_started = time.time()
 
-        while not valid_paraphrase_found and sub_attempt < max_sub_attempts:
+        for sub_attempt, decoded_outputs in enumerate(variants):
             try:
-                with torch.no_grad():
-                    output = model.generate(
-                        input_ids=encoding['input_ids'],
-                        attention_mask=encoding['attention_mask'],
-                        max_new_tokens=available_output_tokens,
-                        do_sample=True,
-                        top_k=40,
-                        top_p=0.95,
-                        temperature=0.8 + 0.1 * sub_attempt,
-                        repetition_penalty=1.2,
-                        no_repeat_ngram_size=3,
-                        num_return_sequences=MAX_RETURN_SEQUENCES
-                    )
-
-                decoded_outputs = [
-                    tokenizer.decode(seq, skip_special_tokens=True).strip()
-                    for seq in output
-                ]
-
-                for idx, d in enumerate(decoded_outputs):
-                    paraphrased = d.replace(prompt, "").strip() if prompt in d else d.strip()
-                    paraphrased = clean_description(paraphrased)
-                    paraphrased = restore_capitalization(paraphrased, capitalized_words)
-
-                    if not paraphrased or len(paraphrased.split()) < 1:
-                        logger.info(f"⛔ Rejected due to empty or too short: \"{paraphrased}\"")
-                        continue
-
-                    is_banned, banned_phrase, context_snippet = contains_banned_phrase(paraphrased, [])
-                    if is_banned:
-                        logger.info(f"⛔ Rejected due to banned phrase '{banned_phrase}' in context: '{context_snippet}' in output: \"{paraphrased}\"")
-                        print(f"⛔ Rejected due to banned phrase '{banned_phrase}' in context: '{context_snippet}' in output: \"{paraphrased}\"")
-                        continue
-                    if has_repetitions(paraphrased):
-                        logger.info(f"⛔ Rejected due to repeated phrases: \"{paraphrased}\"")
-                        continue
-                    if not is_grammatically_correct(paraphrased):
-                        logger.info(f"⛔ Rejected due to grammar: \"{paraphrased}\"")
-                        continue
-                    if not contains_nouns(paraphrased, nouns):
-                        logger.info(f"⛔ Rejected due to missing nouns: \"{paraphrased}\" (required: {nouns})")
-                        continue
-
-                    score, sim, wc = score_paraphrase(title, paraphrased, target_word_count)
+                survivors = candidate_filter.run(decoded_outputs)
+                similarities = similarity_scorer.score(title, [paraphrased for _, paraphrased in survivors])
+                for (idx, paraphrased), sim in zip(survivors, similarities):
+                    score, wc = score_paraphrase(sim, paraphrased, target_word_count)
                     first_diff = not paraphrased.lower().startswith(title.lower())
 
                     print(f"📝 Attempt {attempt + 1}.{sub_attempt + 1}, Option {idx + 1}")
@@ -310,6 +1281,7 @@ def paraphrase_strict_title(title, max_attempts=3, max_sub_attempts=2):
                     if is_valid:
                         print(f"✅ Picked from attempt {attempt + 1}.{sub_attempt + 1}, option {idx + 1}")
                         print(f"→ {paraphrased}\n")
+                        candidate_filter.log_summary()
                         return paraphrased
 
                     if first_diff and score > best_score:
@@ -321,16 +1293,11 @@ def paraphrase_strict_title(title, max_attempts=3, max_sub_attempts=2):
                             f"→ Paraphrased: {paraphrased}"
                         )
 
-                sub_attempt += 1
-                time.sleep(0.5 * (2 ** sub_attempt))
-
             except Exception as e:
                 logger.error(f"Error during attempt {attempt + 1}, sub-attempt {sub_attempt + 1}: {str(e)}")
-                sub_attempt += 1
-                time.sleep(0.5 * (2 ** sub_attempt))
-
-        time.sleep(1)
+        deadline.charge(time.time() - checks_started)
 
+    candidate_filter.log_summary()
     if best_paraphrase:
         print(f"✅ Picked fallback from attempt {best_attempt}")
         print(best_metadata + "\n")
@@ -340,218 +1307,191 @@ def paraphrase_strict_title(title, max_attempts=3, max_sub_attempts=2):
     return clean_title
 
 
+def paraphrase_strict_title(title, max_attempts=3, max_sub_attempts=2):
+    return run_paraphrase_tasks([(_paraphrase_title_task(title, max_attempts, max_sub_attempts), title)])[0]
 
-def paraphrase_strict_company(text, max_attempts=2, max_sub_attempts=2):
-    def contains_prompt(para):
-        prompt_phrases = [
-            "Rephrase the following company details paragraph",
-            "Rephrase the company details",
-            "Paragraph professionally, preserving all key details",
-            "Rewrite the following",
-            "Rephrase the paragraph below",
-            "Rephrase the following company details",
-            "Preserving all key details",
-            "Tone and structure",
-            "Keep the length approximately the same",
-            "Do your company information paragraph need improvements",
-            "Paraphrase", "Paraphrased", "Paraphrasing", "Paragraph", "Company details",
-        ]
-        para_lower = para.lower()
-        for phrase in prompt_phrases:
-            if phrase.lower() in para_lower:
-                start_idx = para_lower.find(phrase.lower())
-                context_start = max(0, start_idx - 20)
-                context_end = min(len(para), start_idx + len(phrase) + 20)
-                context_snippet = para[context_start:context_end]
-                if context_start > 0:
-                    context_snippet = "..." + context_snippet
-                if context_end < len(para):
-                    context_snippet = context_snippet + "..."
-                return True, phrase, context_snippet
-        return False, None, None
-
-    clean_text = sanitize_text(text)
-    if not clean_text:
-        logger.error("Input text is empty after sanitization.")
-        return text
 
-    capitalized_words = extract_capitalized_words(clean_text)
-    logger.debug(f"Extracted capitalized words from text: {list(capitalized_words.values())}")
+def _paraphrase_paragraph_task(para, idx, total, subject, prompt_matcher, profile, max_attempts=2, max_sub_attempts=2, deadline=None):
+    print(f"\n🔹 Paraphrasing Paragraph {idx + 1}/{total}")
 
-    paragraphs = [p.strip() for p in clean_text.split('\n') if p.strip()]
-    final_paraphrased = []
+    prompt = (
+        f"Rephrase the following {subject} paragraph professionally, preserving all key details, tone, and structure. "
+        f"Keep the length approximately the same and avoid repeating the input format:\n{para}"
+    )
 
-    for idx, para in enumerate(paragraphs):
-        print(f"\n🔹 Paraphrasing Paragraph {idx + 1}/{len(paragraphs)}")
+    prompt_tokens = encode_text(prompt, add_special_tokens=True)
+    prompt_token_len = len(prompt_tokens)
 
+    if prompt_token_len > MAX_TOTAL_TOKENS - 200:
+        logger.warning(f"Prompt for paragraph {idx + 1} too long, truncating to fit.")
+        para = " ".join(para.split()[:int((MAX_TOTAL_TOKENS - 200) / 4)])
         prompt = (
-            f"Rephrase the following company details paragraph professionally, preserving all key details, tone, and structure. "
-            f"Keep the length approximately the same and avoid repeating the input format:\n{para}"
+            f"Rephrase the following {subject} paragraph professionally, preserving all key details, tone, and structure. "
+            f"Keep the length approximately the same:\n{para}"
         )
-
-        prompt_tokens = tokenizer.encode(prompt, add_special_tokens=True)
+        prompt_tokens = encode_text(prompt, add_special_tokens=True)
         prompt_token_len = len(prompt_tokens)
 
-        if prompt_token_len > MAX_TOTAL_TOKENS - 200:
-            logger.warning(f"Prompt for paragraph {idx + 1} too long, truncating to fit.")
-            para = " ".join(para.split()[:int((MAX_TOTAL_TOKENS - 200) / 4)])
-            prompt = (
-                f"Rephrase the following company details paragraph professionally, preserving all key details, tone, and structure. "
-                f"Keep the length approximately the same:\n{para}"
-            )
-            prompt_tokens = tokenizer.encode(prompt, add_special_tokens=True)
-            prompt_token_len = len(prompt_tokens)
-
+    cache_key = ParaphraseCache.key(subject, prompt)
+    cached = get_paraphrase_cache().get(cache_key)
+    if cached:
+        print(f"♻️ Reusing cached paraphrase for paragraph {idx + 1}\n")
+        return cached
+
+    target_word_count = len(para.split())
+    tolerance = 0.25
+    min_wc = int(target_word_count * (1 - tolerance))
+    max_wc = int(target_word_count * (1 + tolerance))
+
+    if LENGTH_AWARE_DECODING:
+        # Budget enough tokens for the runaway word limit at this paragraph's tokens-per-word rate.
+        word_limit = math.ceil(max(max_wc, 1) * RUNAWAY_WORD_SLACK)
+        tokens_per_word = len(encode_text(para, add_special_tokens=False)) / max(target_word_count, 1)
+        available_output_tokens = max(OUTPUT_TOKEN_MARGIN, min(
+            math.ceil(word_limit * tokens_per_word) + OUTPUT_TOKEN_MARGIN,
+            MAX_TOTAL_TOKENS - prompt_token_len
+        ))
+    else:
+        word_limit = None
         available_output_tokens = max(200, MAX_TOTAL_TOKENS - prompt_token_len)
-        target_word_count = len(para.split())
-        tolerance = 0.25
-        min_wc = int(target_word_count * (1 - tolerance))
-        max_wc = int(target_word_count * (1 + tolerance))
 
-        encoding = tokenizer.encode_plus(
+    def prompt_echo_reason(text):
+        is_banned, banned_phrase, context_snippet = prompt_matcher.search(text)
+        return f"prompt echo (phrase: '{banned_phrase}' in context: '{context_snippet}')" if is_banned else None
+
+    candidate_filter = CandidateFilter(
+        subject,
+        prepare=lambda d: profile.restore_capitalization(normalize_paraphrase(d.replace(prompt, "").strip() if prompt in d else d.strip())),
+        cheap_stages=[
+            ("too_short", lambda text: "empty or too short" if not text or len(text.split()) < 5 else None),
+            ("prompt_echo", prompt_echo_reason),
+        ],
+        correct=lambda text: profile.restore_capitalization(correct_grammar(text))
+    )
+
+    best_paraphrase = None
+    best_score = -1
+    best_similarity = 0.0
+    best_attempt = ""
+    best_metadata = ""
+    deadline = deadline or FieldDeadline(subject)
+
+    for attempt in range(max_attempts):
+        if deadline.expired(attempt):
+            break
+        request = GenerationRequest(
             prompt,
-            return_tensors="pt",
-            truncation=True,
-            max_length=MAX_TOTAL_TOKENS
-        ).to(device)
+            max_new_tokens=available_output_tokens,
+            temperatures=[0.9 + 0.1 * sub_attempt for sub_attempt in range(max_sub_attempts)],
+            max_words=word_limit,
+            do_sample=True,
+            top_k=40,
+            top_p=0.95,
+            repetition_penalty=1.1,
+            no_repeat_ngram_size=2,
+            num_return_sequences=MAX_RETURN_SEQUENCES
+        )
+        try:
+            variants = yield request
+        except Exception as e:
+            logger.error(f"Error during attempt {attempt + 1} for paragraph {idx + 1}: {str(e)}")
+            continue
+        deadline.charge(request.seconds)
+        checks_started = time.time()
 
-        best_paraphrase = None
-        best_score = -1
-        best_attempt = ""
-        best_metadata = ""
+        for sub_attempt, decoded in enumerate(variants):
+            try:
+                survivors = candidate_filter.run(decoded)
+                similarities = similarity_scorer.score(para, [paraphrased for _, paraphrased in survivors])
+                for (option_index, paraphrased), similarity in zip(survivors, similarities):
+                    word_count = len(paraphrased.split())
+                    score = (similarity + (1 - abs(word_count - target_word_count) / max(target_word_count, 1))) / 2
 
-        for attempt in range(max_attempts):
-            sub_attempt = 0
-            valid_paraphrase_found = False
+                    first_sentence = paraphrased.split(".")[0].strip()
+                    original_first = para.split(".")[0].strip()
+                    first_diff = not first_sentence.lower().startswith(original_first.lower())
 
-            while not valid_paraphrase_found and sub_attempt < max_sub_attempts:
-                try:
-                    with torch.no_grad():
-                        output = model.generate(
-                            input_ids=encoding['input_ids'],
-                            attention_mask=encoding['attention_mask'],
-                            max_new_tokens=available_output_tokens,
-                            do_sample=True,
-                            top_k=40,
-                            top_p=0.95,
-                            temperature=0.9 + 0.1 * sub_attempt,
-                            repetition_penalty=1.1,
-                            no_repeat_ngram_size=2,
-                            num_return_sequences=MAX_RETURN_SEQUENCES
-                        )
+                    print(f"📝 Attempt {attempt + 1}.{sub_attempt + 1}, Option {option_index + 1}")
+                    print(f"↪ Words: {word_count}, Sim: {similarity:.2f}, Score: {score:.2f}, First sentence different: {first_diff}")
+                    print(f"→ First sentence: {first_sentence}\n")
 
-                    decoded = [tokenizer.decode(seq, skip_special_tokens=True).strip() for seq in output]
-
-                    for option_index, d in enumerate(decoded):
-                        paraphrased = d.replace(prompt, "").strip() if prompt in d else d.strip()
-                        paraphrased = clean_description(paraphrased)
-                        paraphrased = restore_capitalization(paraphrased, capitalized_words)
-
-                        if not paraphrased or len(paraphrased.split()) < 5:
-                            logger.info(f"⛔ Rejected due to empty or too short: \"{paraphrased}\"")
-                            continue
-                        is_banned, banned_phrase, context_snippet = contains_prompt(paraphrased)
-                        if is_banned:
-                            print(f"❌ Rejected due to prompt echo (phrase: '{banned_phrase}' in context: '{context_snippet}' in output: \"{paraphrased}\")")
-                            logger.info(f"❌ Rejected due to prompt echo (phrase: '{banned_phrase}' in context: '{context_snippet}' in output: \"{paraphrased}\")")
-                            continue
-
-                        word_count = len(paraphrased.split())
-                        similarity = is_good_paraphrase(para, paraphrased)
-                        score = (similarity + (1 - abs(word_count - target_word_count) / max(target_word_count, 1))) / 2
-
-                        first_sentence = paraphrased.split(".")[0].strip()
-                        original_first = para.split(".")[0].strip()
-                        first_diff = not first_sentence.lower().startswith(original_first.lower())
-
-                        print(f"📝 Attempt {attempt + 1}.{sub_attempt + 1}, Option {option_index + 1}")
-                        print(f"↪ Words: {word_count}, Sim: {similarity:.2f}, Score: {score:.2f}, First sentence different: {first_diff}")
-                        print(f"→ First sentence: {first_sentence}\n")
-
-                        is_valid = (
-                            min_wc <= word_count <= max_wc
-                            and similarity >= (0.65 if target_word_count > 10 else 0.6)
-                            and first_diff
-                            and is_grammatically_correct(paraphrased)
+                    is_valid = (
+                        min_wc <= word_count <= max_wc
+                        and similarity >= (0.65 if target_word_count > 10 else 0.6)
+                        and first_diff
+                        and is_grammatically_correct(paraphrased)
+                    )
+
+                    if is_valid:
+                        print(f"✅ Picked from attempt {attempt + 1}.{sub_attempt + 1}, option {option_index + 1}")
+                        candidate_filter.log_summary()
+                        result = clean_description(paraphrased)
+                        get_paraphrase_cache().put(cache_key, subject, result, similarity, score)
+                        return result
+
+                    if first_diff and score > best_score:
+                        best_score = score
+                        best_similarity = similarity
+                        best_paraphrase = paraphrased
+                        best_attempt = f"{attempt + 1}.{sub_attempt + 1}, option {option_index + 1}"
+                        best_metadata = (
+                            f"↪ Words: {word_count}, Sim: {similarity:.2f}, Score: {score:.2f}, First sentence different: {first_diff}\n"
+                            f"→ First sentence: {first_sentence}"
                         )
 
-                        if is_valid:
-                            print(f"✅ Picked from attempt {attempt + 1}.{sub_attempt + 1}, option {option_index + 1}")
-                            final_paraphrased.append(clean_description(paraphrased))
-                            valid_paraphrase_found = True
-                            break
-
-                        if first_diff and score > best_score:
-                            best_score = score
-                            best_paraphrase = paraphrased
-                            best_attempt = f"{attempt + 1}.{sub_attempt + 1}, option {option_index + 1}"
-                            best_metadata = (
-                                f"↪ Words: {word_count}, Sim: {similarity:.2f}, Score: {score:.2f}, First sentence different: {first_diff}\n"
-                                f"→ First sentence: {first_sentence}"
-                            )
-
-                    if not valid_paraphrase_found:
-                        sub_attempt += 1
-                        time.sleep(0.5 * (2 ** sub_attempt))
+            except Exception as e:
+                logger.error(f"Error during attempt {attempt + 1}, sub-attempt {sub_attempt + 1} for paragraph {idx + 1}: {str(e)}")
+        deadline.charge(time.time() - checks_started)
 
-                except Exception as e:
-                    logger.error(f"Error during attempt {attempt + 1}, sub-attempt {sub_attempt + 1} for paragraph {idx + 1}: {str(e)}")
-                    sub_attempt += 1
-                    time.sleep(0.5 * (2 ** sub_attempt))
+    candidate_filter.log_summary()
+    if best_paraphrase:
+        print(f"✅ Picked fallback from attempt {best_attempt}")
+        print(best_metadata + "\n")
+        result = clean_description(best_paraphrase)
+        get_paraphrase_cache().put(cache_key, subject, result, best_similarity, best_score)
+        return result
 
-            if valid_paraphrase_found:
-                break
-            time.sleep(1)
+    print(f"❌ Paragraph {idx + 1} fallback to original.\n")
+    return para
 
-        if not valid_paraphrase_found:
-            if best_paraphrase:
-                print(f"✅ Picked fallback from attempt {best_attempt}")
-                print(best_metadata + "\n")
-                final_paraphrased.append(clean_description(best_paraphrase))
-            else:
-                print(f"❌ Paragraph {idx + 1} fallback to original.\n")
-                final_paraphrased.append(para)
 
-    return "\n\n".join(final_paraphrased)
+def paragraph_paraphrase_tasks(text, subject, prompt_matcher, max_attempts=2, max_sub_attempts=2):
+    """Split text into paragraphs and build one paraphrase task per paragraph."""
+    clean_text = sanitize_text(text)
+    if not clean_text:
+        logger.error("Input text is empty after sanitization.")
+        return []
 
-def paraphrase_strict_tagline(company_tagline, max_attempts=5):
+    profile = input_profile(clean_text)
+    logger.debug(f"Extracted capitalized words from text: {list(profile.capitalized_words.values())}")
+
+    paragraphs = [p.strip() for p in clean_text.split('\n') if p.strip()]
+    deadline = FieldDeadline(subject)
+    return [
+        (_paraphrase_paragraph_task(para, idx, len(paragraphs), subject, prompt_matcher, profile, max_attempts, max_sub_attempts, deadline), para)
+        for idx, para in enumerate(paragraphs)
+    ]
+
+
+def paraphrase_strict_company(text, max_attempts=2, max_sub_attempts=2):
+    tasks = paragraph_paraphrase_tasks(text, "company details", COMPANY_PROMPT_MATCHER, max_attempts, max_sub_attempts)
+    return "\n\n".join(run_paraphrase_tasks(tasks)) or text
+
+
+def _paraphrase_tagline_task(company_tagline, max_attempts=5):
     clean_text = sanitize_text(company_tagline)
     if not clean_text:
         logger.error(f"Input text is empty after sanitization: {company_tagline}")
         print("Error: Input text is empty after sanitization.")
         return company_tagline
 
-    capitalized_words = extract_capitalized_words(clean_text)
-    logger.debug(f"Extracted capitalized words from tagline: {list(capitalized_words.values())}")
+    profile = input_profile(clean_text)
+    logger.debug(f"Extracted capitalized words from tagline: {list(profile.capitalized_words.values())}")
 
     target_word_count = max(len(clean_text.split()), 8)
     min_word_count = 4
     max_word_count = 15
 
-    rejected_phrases = [
-        "Paraphrased tagline", "Rewrite the following", "Original tagline",
-        "Professionally rewritten", "Crisp and impactful", "Summary:",
-        "Short and professional", "Keep it short", "###", "Tagline:",
-        "Output:", "Company summary", "Paraphrased version", "Rephrased version",
-        "Paraphrase", "Paraphrased", "Paraphrasing", "Summarized", "Summarised",
-        "Summarizing", "Summarising", "Summary"
-    ]
-
-    def contains_rejected_phrase(text):
-        lower = text.lower()
-        for bad_phrase in rejected_phrases:
-            if bad_phrase.lower() in lower:
-                start_idx = lower.find(bad_phrase.lower())
-                context_start = max(0, start_idx - 20)
-                context_end = min(len(text), start_idx + len(bad_phrase) + 20)
-                context_snippet = text[context_start:context_end]
-                if context_start > 0:
-                    context_snippet = "..." + context_snippet
-                if context_end < len(text):
-                    context_snippet = context_snippet + "..."
-                return True, bad_phrase, context_snippet
-        return False, None, None
-
     def first_sentence_diff(original, paraphrased):
         orig_first = original.split(".")[0].strip().lower()
         para_first = paraphrased.split(".")[0].strip().lower()
@@ -563,68 +1503,62 @@ def paraphrase_strict_tagline(company_tagline, max_attempts=5):
         f"### Original ###\n{clean_text}\n\n### Paraphrased Tagline ###"
     )
 
-    input_tokens = tokenizer.encode(input_prompt, add_special_tokens=True)
+    cache_key = ParaphraseCache.key("tagline", input_prompt)
+    cached = get_paraphrase_cache().get(cache_key)
+    if cached:
+        print(f"♻️ Reusing cached tagline paraphrase: {cached}")
+        return cached
+
+    input_tokens = encode_text(input_prompt, add_special_tokens=True)
     max_length = min(len(input_tokens) + 50, 512)
 
-    encoding = tokenizer.encode_plus(
-        input_prompt,
-        return_tensors="pt",
-        truncation=True,
-        max_length=max_length
-    ).to(device)
+    def rejected_phrase_reason(text):
+        is_banned, banned_phrase, context_snippet = TAGLINE_REJECTED_MATCHER.search(text)
+        return f"banned phrase '{banned_phrase}' in context: '{context_snippet}'" if is_banned else None
+
+    candidate_filter = CandidateFilter(
+        "tagline",
+        prepare=lambda d: profile.restore_capitalization(normalize_paraphrase(d.split("### Paraphrased Tagline ###")[1] if "### Paraphrased Tagline ###" in d else d)),
+        cheap_stages=[
+            ("banned_phrase", rejected_phrase_reason),
+            ("word_count", lambda text: f"word count outside {min_word_count}-{max_word_count}" if not min_word_count <= len(text.split()) <= max_word_count else None),
+        ],
+        correct=lambda text: profile.restore_capitalization(correct_grammar(text)),
+        expensive_stages=[
+            ("grammar", lambda text: "grammar" if not is_grammatically_correct(text) else None),
+        ]
+    )
 
     best_paraphrase = None
     best_score = -1
     best_meta = {"attempt": -1, "similarity": 0.0, "word_count": 0, "first_diff": False}
+    deadline = FieldDeadline("tagline")
 
     for attempt in range(max_attempts):
+        if deadline.expired(attempt):
+            break
+        request = GenerationRequest(
+            input_prompt,
+            max_new_tokens=25,
+            temperatures=[0.9],
+            max_length=max_length,
+            do_sample=True,
+            top_k=50,
+            top_p=0.9,
+            repetition_penalty=1.2,
+            no_repeat_ngram_size=2,
+            num_return_sequences=6,
+            eos_token_id=get_tokenizer().eos_token_id
+        )
         try:
-            with torch.no_grad():
-                outputs = model.generate(
-                    input_ids=encoding['input_ids'],
-                    attention_mask=encoding['attention_mask'],
-                    max_new_tokens=25,
-                    do_sample=True,
-                    top_k=50,
-                    top_p=0.9,
-                    temperature=0.9,
-                    repetition_penalty=1.2,
-                    no_repeat_ngram_size=2,
-                    num_return_sequences=6,
-                    eos_token_id=tokenizer.eos_token_id
-                )
-
-            decoded_outputs = [
-                tokenizer.decode(seq, skip_special_tokens=True).strip()
-                for seq in outputs
-            ]
-
-            paraphrases = []
-            for d in decoded_outputs:
-                if "### Paraphrased Tagline ###" in d:
-                    parts = d.split("### Paraphrased Tagline ###")
-                    paraphrased = clean_description(parts[1]) if len(parts) >= 2 else clean_description(d)
-                else:
-                    paraphrased = clean_description(d)
-                paraphrased = restore_capitalization(paraphrased, capitalized_words)
-                paraphrases.append(paraphrased)
-
-            for paraphrased in paraphrases:
-                is_banned, banned_phrase, context_snippet = contains_rejected_phrase(paraphrased)
-                if is_banned:
-                    logger.info(f"⛔ Rejected tagline due to banned phrase '{banned_phrase}' in context: '{context_snippet}' in output: \"{paraphrased}\"")
-                    print(f"⛔ Rejected tagline due to banned phrase '{banned_phrase}' in context: '{context_snippet}' in output: \"{paraphrased}\"")
-                    continue
-
-                if not is_grammatically_correct(paraphrased):
-                    logger.info(f"⛔ Rejected tagline due to grammar: \"{paraphrased}\"")
-                    continue
+            decoded_outputs = (yield request)[0]
+            deadline.charge(request.seconds)
+            checks_started = time.time()
 
+            survivors = candidate_filter.run(decoded_outputs)
+            similarities = similarity_scorer.score(clean_text, [paraphrased for _, paraphrased in survivors])
+            for (_, paraphrased), similarity in zip(survivors, similarities):
                 word_count = len(paraphrased.split())
-                if word_count < min_word_count or word_count > max_word_count:
-                    continue
-
-                similarity = is_good_paraphrase(clean_text, paraphrased)
                 length_score = 1 - abs(target_word_count - word_count) / target_word_count
                 score = similarity * 0.7 + length_score * 0.3
                 first_diff = first_sentence_diff(clean_text, paraphrased)
@@ -639,13 +1573,12 @@ def paraphrase_strict_tagline(company_tagline, max_attempts=5):
                         "word_count": word_count,
                         "first_diff": first_diff
                     }
+            deadline.charge(time.time() - checks_started)
 
         except Exception as e:
             logger.error(f"Error during paraphrasing attempt {attempt + 1}: {str(e)}")
 
-        if attempt < max_attempts - 1:
-            time.sleep(2 ** attempt)
-
+    candidate_filter.log_summary()
     if best_paraphrase:
         logger.info(
             f"✅ Picked tagline from attempt {best_meta['attempt']} "
@@ -655,230 +1588,333 @@ def paraphrase_strict_tagline(company_tagline, max_attempts=5):
             f"\n✅ Picked tagline from attempt {best_meta['attempt']} "
             f"(words: {best_meta['word_count']}, similarity: {best_meta['similarity']:.2f}, score: {best_score:.2f}, first sentence different: {best_meta['first_diff']})"
         )
+        get_paraphrase_cache().put(cache_key, "tagline", best_paraphrase, best_meta['similarity'], best_score)
         return best_paraphrase
 
     logger.warning("No valid tagline candidates produced. Returning original.")
     return clean_text
 
-def paraphrase_strict_description(text, max_attempts=2, max_sub_attempts=2):
-    def contains_prompt(para):
-        prompt_phrases = [
-            "Rephrase the following job description paragraph",
-            "Rephrase the job description",
-            "Paragraph professionally, preserving all key details",
-            "Rewrite the following",
-            "Rephrase the paragraph below",
-            "Rephrase the following job description",
-            "Preserving all key details",
-            "Tone and structure",
-            "Keep the length approximately the same",
-            "Job description paragraph professionally",
-            "Paraphrase", "Paraphrased", "Paraphrase the following",
-            "Paraphrase the job description", "Paraphrasing",
-            "Job description", "Job description paragraph",
-        ]
-        para_lower = para.lower()
-        for phrase in prompt_phrases:
-            if phrase.lower() in para_lower:
-                start_idx = para_lower.find(phrase.lower())
-                context_start = max(0, start_idx - 20)
-                context_end = min(len(para), start_idx + len(phrase) + 20)
-                context_snippet = para[context_start:context_end]
-                if context_start > 0:
-                    context_snippet = "..." + context_snippet
-                if context_end < len(para):
-                    context_snippet = context_snippet + "..."
-                return True, phrase, context_snippet
-        return False, None, None
 
-    clean_text = sanitize_text(text)
-    if not clean_text:
-        logger.error("Input text is empty after sanitization.")
-        return text
-
-    capitalized_words = extract_capitalized_words(clean_text)
-    logger.debug(f"Extracted capitalized words from text: {list(capitalized_words.values())}")
-
-    paragraphs = [p.strip() for p in clean_text.split('\n') if p.strip()]
-    final_paraphrased = []
+def paraphrase_strict_tagline(company_tagline, max_attempts=5):
+    return run_paraphrase_tasks([(_paraphrase_tagline_task(company_tagline, max_attempts), company_tagline)])[0]
 
-    for idx, para in enumerate(paragraphs):
-        print(f"\n🔹 Paraphrasing Paragraph {idx + 1}/{len(paragraphs)}")
 
-        prompt = (
-            f"Rephrase the following job description paragraph professionally, preserving all key details, tone, and structure. "
-            f"Keep the length approximately the same and avoid repeating the input format:\n{para}"
+def paraphrase_strict_description(text, max_attempts=2, max_sub_attempts=2):
+    tasks = paragraph_paraphrase_tasks(text, "job description", DESCRIPTION_PROMPT_MATCHER, max_attempts, max_sub_attempts)
+    return "\n\n".join(run_paraphrase_tasks(tasks)) or text
+
+
+def paraphrase_page_jobs(jobs, processed_companies, max_attempts=5):
+    """Paraphrase a batch of jobs, plus the profiles of companies about to be published, in one batched pass.
+
+    `jobs` holds (job_data, company_data) pairs. Returns a list of (title, description)
+    pairs, one per job, and a dict mapping company name to its (details, tagline) pair.
+    """
+    groups = []
+    job_groups = []
+    company_groups = {}
+    for job_data, company_data in jobs:
+        title = extract_job_title(job_data.get("Job Title", ""))
+        description = job_data.get("Job Description", "")
+        job_groups.append(len(groups))
+        groups.append([(_paraphrase_title_task(title, max_attempts=max_attempts), title)])
+        groups.append(paragraph_paraphrase_tasks(description, "job description", DESCRIPTION_PROMPT_MATCHER, max_attempts=max_attempts))
+        company_name = job_data.get("Company", "Unknown Company")
+        if company_name in processed_companies or company_name == "Unknown Company" or company_name in company_groups:
+            continue
+        company_details = company_data.get("company_details", "")
+        company_tagline = sanitize_text(company_details)
+        company_groups[company_name] = len(groups)
+        groups.append(paragraph_paraphrase_tasks(company_details, "company details", COMPANY_PROMPT_MATCHER, max_attempts=5) if company_details else [])
+        groups.append([(_paraphrase_tagline_task(company_tagline, max_attempts=5), company_tagline)] if company_tagline else [])
+
+    logger.info(f"Paraphrasing {len(jobs)} jobs and {len(company_groups)} companies in one batched pass")
+    results = run_task_groups(groups)
+    job_results = []
+    for (job_data, company_data), offset in zip(jobs, job_groups):
+        title_result, description_result = results[offset], results[offset + 1]
+        job_results.append((title_result[0], "\n\n".join(description_result) or job_data.get("Job Description", "")))
+    company_results = {}
+    for company_name, offset in company_groups.items():
+        details_result, tagline_result = results[offset], results[offset + 1]
+        company_results[company_name] = ("\n\n".join(details_result), tagline_result[0] if tagline_result else "")
+    return job_results, company_results
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, using double hashing of one blake2b digest."""
+
+    def __init__(self, capacity, error_rate, bits=None, count=0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(64, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+
+    @staticmethod
+    def digest(value):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def _positions(self, digest):
+        h1, h2 = digest
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, digest):
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def contains(self, digest):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class ScalableBloomFilter:
+    """Bloom filter that adds a 4x larger, tighter slice whenever the newest one fills up.
+
+    The error rates of the slices form a geometric series, so the overall false-positive
+    rate stays under `error_rate` however many entries are added.
+    """
+
+    def __init__(self, capacity=SEEN_FILTER_CAPACITY, error_rate=SEEN_FILTER_ERROR_RATE, filters=None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filters = filters or [BloomFilter(capacity, error_rate / 2)]
+
+    def add(self, value):
+        digest = BloomFilter.digest(value)
+        if any(f.contains(digest) for f in self.filters):
+            return
+        if self.filters[-1].count >= self.filters[-1].capacity:
+            last = self.filters[-1]
+            self.filters.append(BloomFilter(last.capacity * 4, last.error_rate / 2))
+        self.filters[-1].add(digest)
+
+    def __contains__(self, value):
+        digest = BloomFilter.digest(value)
+        return any(f.contains(digest) for f in self.filters)
+
+
+class ProcessedJobsLedger:
+    """SQLite record of every processed job, replacing the CSV that was rewritten on each insert.
+
+    Job ID and Job URL are unique, so membership checks and duplicate suppression are
+    index lookups. Rows are buffered and committed in batches of LEDGER_COMMIT_ROWS (or
+    after LEDGER_COMMIT_SECONDS); buffered rows already count as processed. The database
+    runs in WAL mode, so a kill mid-commit leaves every earlier batch intact, and
+    PROCESSED_IDS_FILE is imported once on first open.
+
+    `contains` answers most lookups from a Bloom filter per column (SEEN_KINDS), which is
+    stored in the same database and only rebuilt when it is older than the table; the
+    indexed query runs only to confirm a filter hit.
+    """
+
+    SEEN_KINDS = ("job_id", "job_url", "company_name")
+
+    def __init__(self, path=PROCESSED_JOBS_DB, csv_path=PROCESSED_IDS_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.pending = []
+        self.pending_since = None
+        self.commit_timer = None
+        self.pending_keys = {kind: set() for kind in self.SEEN_KINDS}
+        self.stats = Counter()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_jobs ("
+            "job_id TEXT PRIMARY KEY, job_url TEXT UNIQUE, company_name TEXT, url_page TEXT, job_number TEXT, processed_at REAL)"
         )
-
-        prompt_tokens = tokenizer.encode(prompt, add_special_tokens=True)
-        prompt_token_len = len(prompt_tokens)
-
-        if prompt_token_len > MAX_TOTAL_TOKENS - 200:
-            logger.warning(f"Prompt for paragraph {idx + 1} too long, truncating to fit.")
-            para = " ".join(para.split()[:int((MAX_TOTAL_TOKENS - 200) / 4)])
-            prompt = (
-                f"Rephrase the following job description paragraph professionally, preserving all key details, tone, and structure. "
-                f"Keep the length approximately the same:\n{para}"
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_processed_jobs_company ON processed_jobs (company_name)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS ledger_meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_filters ("
+            "kind TEXT, slice INTEGER, capacity INTEGER, error_rate REAL, count INTEGER, bits BLOB, PRIMARY KEY (kind, slice))"
+        )
+        self.conn.commit()
+        self._migrate_csv(csv_path)
+        self._load_filters()
+
+    def _migrate_csv(self, csv_path):
+        if self.conn.execute("SELECT 1 FROM ledger_meta WHERE key = 'csv_migrated'").fetchone():
+            return
+        rows = []
+        if os.path.exists(csv_path):
+            try:
+                df = pd.read_csv(csv_path, dtype=str).fillna('')
+                for col in ['Job ID', 'Job URL', 'Company Name', 'URL Page', 'Job Number']:
+                    if col not in df.columns:
+                        df[col] = ''
+                rows = [
+                    (row['Job ID'], row['Job URL'] or None, row['Company Name'], row['URL Page'], row['Job Number'], time.time())
+                    for _, row in df.iterrows() if row['Job ID']
+                ]
+            except Exception as e:
+                logger.error(f"Error reading {csv_path} for migration: {str(e)}. Starting with an empty ledger.")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO processed_jobs (job_id, job_url, company_name, url_page, job_number, processed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.execute("INSERT OR REPLACE INTO ledger_meta (key, value) VALUES ('csv_migrated', ?)", (str(len(rows)),))
+        if rows:
+            logger.info(f"Migrated {len(rows)} processed jobs from {csv_path} to {self.path}")
+
+    def _stamp(self):
+        # Rows are only ever inserted, so the highest rowid identifies the table's contents
+        return str(self.conn.execute("SELECT MAX(rowid) FROM processed_jobs").fetchone()[0] or 0)
+
+    def _load_filters(self):
+        started = time.time()
+        saved = self.conn.execute("SELECT value FROM ledger_meta WHERE key = 'seen_filters_stamp'").fetchone()
+        if saved and saved[0] == self._stamp():
+            slices = {kind: [] for kind in self.SEEN_KINDS}
+            for kind, capacity, error_rate, count, bits in self.conn.execute(
+                "SELECT kind, capacity, error_rate, count, bits FROM seen_filters ORDER BY kind, slice"
+            ):
+                slices[kind].append(BloomFilter(capacity, error_rate, bits, count))
+            self.filters = {kind: ScalableBloomFilter(filters=slices[kind] or None) for kind in self.SEEN_KINDS}
+            logger.info(f"Loaded seen-job filters from {self.path} in {1000 * (time.time() - started):.0f} ms")
+            return
+        self.filters = {kind: ScalableBloomFilter() for kind in self.SEEN_KINDS}
+        for row in self.conn.execute(f"SELECT {', '.join(self.SEEN_KINDS)} FROM processed_jobs"):
+            for kind, value in zip(self.SEEN_KINDS, row):
+                if value:
+                    self.filters[kind].add(value)
+        self._save_filters()
+        logger.info(f"Rebuilt seen-job filters from {self.path} in {1000 * (time.time() - started):.0f} ms")
+
+    def _save_filters(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM seen_filters")
+            self.conn.executemany(
+                "INSERT INTO seen_filters (kind, slice, capacity, error_rate, count, bits) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (kind, index, f.capacity, f.error_rate, f.count, bytes(f.bits))
+                    for kind in self.SEEN_KINDS
+                    for index, f in enumerate(self.filters[kind].filters)
+                ]
+            )
+            self.conn.execute("INSERT OR REPLACE INTO ledger_meta (key, value) VALUES ('seen_filters_stamp', ?)", (self._stamp(),))
+
+    def contains(self, kind, value):
+        """True if a job with this job_id / job_url / company_name has been recorded."""
+        if not value:
+            return False
+        value = str(value)
+        with self.lock:
+            if value not in self.filters[kind]:
+                self.stats["filtered"] += 1
+                return False
+            if value in self.pending_keys[kind]:
+                return True
+            found = self.conn.execute(f"SELECT 1 FROM processed_jobs WHERE {kind} = ? LIMIT 1", (value,)).fetchone() is not None
+        self.stats["confirmed" if found else "false_positives"] += 1
+        return found
+
+    def count(self, kind):
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(DISTINCT {kind}) FROM processed_jobs").fetchone()[0] + len(self.pending_keys[kind])
+
+    def view(self, kind):
+        return LedgerView(self, kind)
+
+    def add(self, job_id, job_url, company_name, url_page, job_number):
+        with self.lock:
+            self.pending.append((job_id, job_url or None, company_name, url_page, job_number, time.time()))
+            for kind, value in zip(self.SEEN_KINDS, (job_id, job_url, company_name)):
+                if value:
+                    self.filters[kind].add(value)
+                    self.pending_keys[kind].add(value)
+            if self.pending_since is None:
+                self.pending_since = time.time()
+                # The time bound must hold even if nothing else is published for hours
+                self.commit_timer = threading.Timer(LEDGER_COMMIT_SECONDS, self._commit_on_timer)
+                self.commit_timer.daemon = True
+                self.commit_timer.start()
+            if len(self.pending) >= LEDGER_COMMIT_ROWS:
+                self._commit()
+
+    def _commit_on_timer(self):
+        with self.lock:
+            self._commit()
+
+    def _commit(self):
+        if self.commit_timer is not None:
+            self.commit_timer.cancel()
+            self.commit_timer = None
+        if not self.pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO processed_jobs (job_id, job_url, company_name, url_page, job_number, processed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self.pending
             )
-            prompt_tokens = tokenizer.encode(prompt, add_special_tokens=True)
-            prompt_token_len = len(prompt_tokens)
+        logger.debug(f"Committed {len(self.pending)} processed jobs to {self.path}")
+        self.pending = []
+        self.pending_since = None
+        for keys in self.pending_keys.values():
+            keys.clear()
+
+    def flush(self):
+        with self.lock:
+            self._commit()
+            self._save_filters()
+
+    def log_stats(self):
+        logger.info(
+            f"Seen-job checks: {self.stats['filtered']} answered by the filter, {self.stats['confirmed']} confirmed, "
+            f"{self.stats['false_positives']} false positives"
+        )
 
-        available_output_tokens = max(200, MAX_TOTAL_TOKENS - prompt_token_len)
-        target_word_count = len(para.split())
-        tolerance = 0.25
-        min_wc = int(target_word_count * (1 - tolerance))
-        max_wc = int(target_word_count * (1 + tolerance))
+    def close(self):
+        with self.lock:
+            self._commit()
+            self._save_filters()
+            # Fold the WAL back in; if the run is killed before this, the workflow uploads the -wal file too
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.close()
 
-        encoding = tokenizer.encode_plus(
-            prompt,
-            return_tensors="pt",
-            truncation=True,
-            max_length=MAX_TOTAL_TOKENS
-        ).to(device)
+class LedgerView:
+    """Read-only, set-like view of one ledger column, for `in` checks in the pipeline stages."""
 
-        best_paraphrase = None
-        best_score = -1
-        best_attempt = ""
-        best_metadata = ""
+    def __init__(self, ledger, kind):
+        self.ledger = ledger
+        self.kind = kind
 
-        for attempt in range(max_attempts):
-            sub_attempt = 0
-            valid_paraphrase_found = False
+    def __contains__(self, value):
+        return self.ledger.contains(self.kind, value)
 
-            while not valid_paraphrase_found and sub_attempt < max_sub_attempts:
-                try:
-                    with torch.no_grad():
-                        output = model.generate(
-                            input_ids=encoding['input_ids'],
-                            attention_mask=encoding['attention_mask'],
-                            max_new_tokens=available_output_tokens,
-                            do_sample=True,
-                            top_k=40,
-                            top_p=0.95,
-                            temperature=0.9 + 0.1 * sub_attempt,
-                            repetition_penalty=1.1,
-                            no_repeat_ngram_size=2,
-                            num_return_sequences=MAX_RETURN_SEQUENCES
-                        )
+    def __len__(self):
+        return self.ledger.count(self.kind)
 
-                    decoded = [tokenizer.decode(seq, skip_special_tokens=True).strip() for seq in output]
-
-                    for option_index, d in enumerate(decoded):
-                        paraphrased = d.replace(prompt, "").strip() if prompt in d else d.strip()
-                        paraphrased = clean_description(paraphrased)
-                        paraphrased = restore_capitalization(paraphrased, capitalized_words)
-
-                        if not paraphrased or len(paraphrased.split()) < 5:
-                            logger.info(f"⛔ Rejected due to empty or too short: \"{paraphrased}\"")
-                            continue
-                        is_banned, banned_phrase, context_snippet = contains_prompt(paraphrased)
-                        if is_banned:
-                            print(f"❌ Rejected due to prompt echo (phrase: '{banned_phrase}' in context: '{context_snippet}' in output: \"{paraphrased}\")")
-                            logger.info(f"❌ Rejected due to prompt echo (phrase: '{banned_phrase}' in context: '{context_snippet}' in output: \"{paraphrased}\")")
-                            continue
-
-                        word_count = len(paraphrased.split())
-                        similarity = is_good_paraphrase(para, paraphrased)
-                        score = (similarity + (1 - abs(word_count - target_word_count) / max(target_word_count, 1))) / 2
-
-                        first_sentence = paraphrased.split(".")[0].strip()
-                        original_first = para.split(".")[0].strip()
-                        first_diff = not first_sentence.lower().startswith(original_first.lower())
-
-                        print(f"📝 Attempt {attempt + 1}.{sub_attempt + 1}, Option {option_index + 1}")
-                        print(f"↪ Words: {word_count}, Sim: {similarity:.2f}, Score: {score:.2f}, First sentence different: {first_diff}")
-                        print(f"→ First sentence: {first_sentence}\n")
-
-                        is_valid = (
-                            min_wc <= word_count <= max_wc
-                            and similarity >= (0.65 if target_word_count > 10 else 0.6)
-                            and first_diff
-                            and is_grammatically_correct(paraphrased)
-                        )
+def _open_processed_jobs_ledger():
+    ledger = ProcessedJobsLedger()
+    atexit.register(ledger.close)
+    return ledger
 
-                        if is_valid:
-                            print(f"✅ Picked from attempt {attempt + 1}.{sub_attempt + 1}, option {option_index + 1}")
-                            final_paraphrased.append(clean_description(paraphrased))
-                            valid_paraphrase_found = True
-                            break
-
-                        if first_diff and score > best_score:
-                            best_score = score
-                            best_paraphrase = paraphrased
-                            best_attempt = f"{attempt + 1}.{sub_attempt + 1}, option {option_index + 1}"
-                            best_metadata = (
-                                f"↪ Words: {word_count}, Sim: {similarity:.2f}, Score: {score:.2f}, First sentence different: {first_diff}\n"
-                                f"→ First sentence: {first_sentence}"
-                            )
-
-                    if not valid_paraphrase_found:
-                        sub_attempt += 1
-                        time.sleep(0.5 * (2 ** sub_attempt))
-
-                except Exception as e:
-                    logger.error(f"Error during attempt {attempt + 1}, sub-attempt {sub_attempt + 1} for paragraph {idx + 1}: {str(e)}")
-                    sub_attempt += 1
-                    time.sleep(0.5 * (2 ** sub_attempt))
-
-            if valid_paraphrase_found:
-                break
-            time.sleep(1)
-
-        if not valid_paraphrase_found:
-            if best_paraphrase:
-                print(f"✅ Picked fallback from attempt {best_attempt}")
-                print(best_metadata + "\n")
-                final_paraphrased.append(clean_description(best_paraphrase))
-            else:
-                print(f"❌ Paragraph {idx + 1} fallback to original.\n")
-                final_paraphrased.append(para)
-
-    return "\n\n".join(final_paraphrased)
+def get_processed_jobs_ledger():
+    return _lazy_resource("processed jobs ledger", _open_processed_jobs_ledger)
 
 def load_kenya_processed_job_ids():
-    if not os.path.exists(PROCESSED_IDS_FILE):
-        logger.info(f"{PROCESSED_IDS_FILE} does not exist. Initializing empty sets.")
-        return set(), set(), set()
-    try:
-        df = pd.read_csv(PROCESSED_IDS_FILE)
-        required_columns = ['Job ID', 'Job URL', 'Company Name', 'URL Page', 'Job Number']
-        for col in required_columns:
-            if col not in df.columns:
-                df[col] = ''
-        job_ids = set(df['Job ID'].fillna('').astype(str).tolist())
-        job_urls = set(df['Job URL'].fillna('').astype(str).tolist())
-        company_names = set(df['Company Name'].fillna('').astype(str).tolist())
-        logger.info(f"Loaded {len(job_ids)} Job IDs, {len(job_urls)} Job URLs, and {len(company_names)} Company Names from {PROCESSED_IDS_FILE}")
-        return job_ids, job_urls, company_names
-    except Exception as e:
-        logger.error(f"Error reading {PROCESSED_IDS_FILE}: {str(e)}. Initializing empty sets.")
-        print(f"Error reading {PROCESSED_IDS_FILE}: {str(e)}. Using empty sets.")
-        return set(), set(), set()
+    """Return live views of the processed Job IDs, Job URLs and Company Names."""
+    return tuple(get_processed_jobs_ledger().view(kind) for kind in ProcessedJobsLedger.SEEN_KINDS)
+
+def job_id_for_url(job_url):
+    return hashlib.md5(job_url.encode()).hexdigest()[:16]
 
-def save_processed_job_id(job_id, job_url, company_name, url_page, job_number):
+def save_processed_job_id(job_id, job_url, company_name, url_page="", job_number=""):
     try:
         job_id = str(job_id)
         job_url = sanitize_text(str(job_url), is_url=True)
         company_name = sanitize_text(str(company_name))
         url_page = str(url_page)
         job_number = str(job_number)
-        new_row = pd.DataFrame({
-            'Job ID': [job_id],
-            'Job URL': [job_url],
-            'Company Name': [company_name],
-            'URL Page': [url_page],
-            'Job Number': [job_number]
-        })
-        if os.path.exists(PROCESSED_IDS_FILE):
-            df = pd.read_csv(PROCESSED_IDS_FILE)
-            if not df.empty and job_id not in df['Job ID'].astype(str).values:
-                df = pd.concat([df, new_row], ignore_index=True)
-                df.to_csv(PROCESSED_IDS_FILE, index=False)
-            elif df.empty:
-                new_row.to_csv(PROCESSED_IDS_FILE, index=False)
-        else:
-            new_row.to_csv(PROCESSED_IDS_FILE, index=False)
-        logger.info(f"Saved Job ID {job_id}, URL {job_url}, Company {company_name}, Page {url_page}, Job Number {job_number} to {PROCESSED_IDS_FILE}")
+        get_processed_jobs_ledger().add(job_id, job_url, company_name, url_page, job_number)
+        logger.info(f"Saved Job ID {job_id}, URL {job_url}, Company {company_name}, Page {url_page}, Job Number {job_number} to {PROCESSED_JOBS_DB}")
     except Exception as e:
         logger.error(f"Error saving Job ID {job_id}: {str(e)}")
         print(f"Error saving Job ID {job_id}: {str(e)}")
@@ -904,21 +1940,401 @@ def validate_application_method(value, is_email=False):
         return bool(re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', value))
     return bool(re.match(r'^https?://[^\s/$.?#].[^\s]*$', value))
 
-def clean_application_url(url):
-    if not url:
-        return url
+class TokenBucket:
+    """Request budget for one host: `rate` per second with bursts of `burst`, paused while the host is throttling us.
+
+    A 429/503 blocks the host until its Retry-After (or an exponential RATE_LIMIT_BACKOFF)
+    and halves the rate; every later success wins back 10% of the configured rate.
+    """
+
+    def __init__(self, host, rate, burst=RATE_LIMIT_BURST):
+        self.host = host
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff = RATE_LIMIT_BACKOFF
+        self.lock = threading.Lock()
+        self.stats = Counter()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.stats["requests"] += 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            self.stats["waits"] += 1
+            idle_sleep(wait, f"rate limit {self.host}")
+
+    def throttled(self, retry_after=None):
+        with self.lock:
+            pause = retry_after if retry_after is not None else self.backoff
+            self.backoff = min(self.backoff * 2, 300)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+            self.tokens = 0.0
+            self.stats["throttled"] += 1
+        logger.warning(f"{self.host} is throttling requests; pausing {pause:.0f}s, rate now {self.rate:.2f}/s")
+
+    def succeeded(self):
+        with self.lock:
+            self.backoff = RATE_LIMIT_BACKOFF
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, created on first use from HOST_RATE_LIMITS."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(host, HOST_RATE_LIMITS.get(host, DEFAULT_HOST_RATE_LIMIT))
+            return self.buckets[host]
+
+    def log_stats(self):
+        for host, bucket in self.buckets.items():
+            logger.info(
+                f"Rate limit {host}: {bucket.stats['requests']} requests, {bucket.stats['waits']} waits, "
+                f"{bucket.stats['throttled']} throttled responses, rate {bucket.rate:.2f}/{bucket.max_rate:.2f} per second"
+            )
+
+rate_limiter = HostRateLimiter()
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
     try:
-        session = requests.Session()
-        retries = Retry(total=3, backoff_factor=2, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
-        session.mount("https://", HTTPAdapter(max_retries=retries))
-        response = session.get(url, headers=HEADERS, timeout=10, allow_redirects=True)
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that spends a host token per request and owns 429/503 handling.
+
+    Throttled responses pause the whole host (every thread using it), then the request is
+    re-sent up to RATE_LIMIT_RETRIES times. urllib3 keeps retrying the other statuses.
+    """
+
+    def __init__(self, *args, max_retries=0, **kwargs):
+        if isinstance(max_retries, Retry):
+            max_retries = max_retries.new(
+                status_forcelist=set(max_retries.status_forcelist or ()) - {429, 503},
+                respect_retry_after_header=False
+            )
+        super().__init__(*args, max_retries=max_retries, **kwargs)
+
+    def send(self, request, **kwargs):
+        bucket = rate_limiter.bucket(request.url)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            bucket.acquire()
+            response = super().send(request, **kwargs)
+            if response.status_code not in (429, 503):
+                bucket.succeeded()
+                return response
+            bucket.throttled(parse_retry_after(response.headers.get("Retry-After")))
+            if attempt < RATE_LIMIT_RETRIES:
+                response.close()
+        return response
+
+
+def create_scrape_session():
+    """Keep-alive session shared by every scraping request, sized for the fetch workers."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET", "HEAD"])
+    adapter = RateLimitedAdapter(pool_connections=SCRAPE_WORKERS, pool_maxsize=SCRAPE_WORKERS * 2, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class WordPressClient:
+    """The one keep-alive, authenticated session behind every WordPress REST call.
+
+    Basic auth is set on the session once. Calls share a connection pool, the site's rate
+    limit and one retry policy: connection errors are retried for every method, 500/502/504
+    only for reads, with exponential backoff (429/503 belong to RateLimitedAdapter). Every
+    call is timed into a per-endpoint latency histogram.
+    """
+
+    def __init__(self, username=WP_USERNAME, password=WP_APP_PASSWORD):
+        self.session = requests.Session()
+        auth = base64.b64encode(f"{username}:{password}".encode()).decode()
+        self.session.headers.update({"Authorization": f"Basic {auth}"})
+        self.session.verify = False
+        retries = Retry(total=3, connect=3, backoff_factor=1, status_forcelist=[500, 502, 504], allowed_methods=["GET", "HEAD", "PUT", "DELETE"])
+        adapter = RateLimitedAdapter(pool_connections=2, pool_maxsize=4, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.batch_supported = True
+
+    def request(self, method, url, timeout=15, **kwargs):
+        endpoint = f"{method} {urlparse(url).path}"
+        started = time.perf_counter()
+        try:
+            return self.session.request(method, url, timeout=timeout, **kwargs)
+        finally:
+            self._record(endpoint, time.perf_counter() - started)
+
+    def _record(self, endpoint, seconds):
+        bound = next((b for b in WP_LATENCY_BUCKETS if seconds <= b), math.inf)
+        with self.lock:
+            histogram = self.latencies.setdefault(endpoint, Counter())
+            histogram[bound] += 1
+            histogram["total_seconds"] += seconds
+
+    def _json(self, method, url, **kwargs):
+        response = self.request(method, url, **kwargs)
         response.raise_for_status()
-        final_url = response.url
-        parsed_url = urlparse(final_url)
+        return response.json()
+
+    def find_by_slug(self, url, slug):
+        """Posts or terms at a collection URL whose slug is `slug` (usually zero or one)."""
+        return self._json("GET", url, params={"slug": slug}, timeout=10)
+
+    def find_by_slugs(self, url, slugs):
+        """{slug: post} for those of `slugs` that already exist at a collection URL, in one GET.
+
+        Slugs are matched in their wp_slug form: WordPress splits the slug list on commas and
+        spaces and compares sanitized slugs, so raw ones would never match.
+        """
+        wanted = {wp_slug(slug): slug for slug in slugs if wp_slug(slug)}
+        if not wanted:
+            return {}
+        posts = self._json("GET", url, params={"slug": ",".join(wanted), "per_page": 100}, timeout=10)
+        return {wanted[post["slug"]]: post for post in posts if post.get("slug") in wanted}
+
+    def list_all(self, url, fields):
+        """Every item of a collection, fetched 100 per page with only `fields`."""
+        items = []
+        page = 1
+        while True:
+            response = self.request("GET", url, params={"per_page": 100, "page": page, "_fields": fields})
+            response.raise_for_status()
+            items.extend(response.json())
+            if page >= int(response.headers.get("X-WP-TotalPages", 1)):
+                return items
+            page += 1
+
+    def create_post(self, post_data):
+        """Create a job listing; returns the created post."""
+        return self._json("POST", WP_URL, json=post_data)
+
+    def create_company(self, post_data):
+        """Create a company post; returns the created post."""
+        return self._json("POST", WP_COMPANY_URL, json=post_data)
+
+    def upload_media(self, content, filename, content_type):
+        """Upload a file to the media library; returns the attachment."""
+        headers = {"Content-Disposition": f"attachment; filename={filename}", "Content-Type": content_type}
+        return self._json("POST", WP_MEDIA_URL, headers=headers, data=content, timeout=10)
+
+    def create_term(self, taxonomy_url, name, slug):
+        """Create a taxonomy term and return its ID, or the existing term's ID if WordPress already has it."""
+        response = self.request("POST", taxonomy_url, json={"name": name, "slug": slug}, timeout=10)
+        if response.status_code == 400:
+            body = response.json()
+            if body.get("code") == "term_exists":
+                return body["data"]["term_id"]
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def batch(self, calls):
+        """Send (method, url, body) calls through /batch/v1, WP_BATCH_MAX per request.
+
+        Returns one (status, body) per call, in order. WordPress runs the calls of a batch
+        independently, so one failure does not undo the others. A batch request that fails
+        as a whole gives each of its calls status None (or the batch's own HTTP status) and
+        the error as body.
+        """
+        results = []
+        for start in range(0, len(calls), WP_BATCH_MAX):
+            chunk = calls[start:start + WP_BATCH_MAX]
+            payload = {"requests": [
+                {"method": method, "path": urlparse(url).path.split("/wp-json", 1)[-1], "body": body}
+                for method, url, body in chunk
+            ]}
+            try:
+                response = self.request("POST", WP_BATCH_URL, json=payload, timeout=60)
+                if response.status_code == 404:
+                    # WordPress before 5.6 has no batch route
+                    self.batch_supported = False
+                response.raise_for_status()
+                results.extend((item.get("status"), item.get("body") or {}) for item in response.json()["responses"])
+            except (RequestException, ValueError, KeyError) as e:
+                error = {"code": "batch_failed", "message": str(e)}
+                status = None
+                if isinstance(e, RequestException) and e.response is not None:
+                    status = e.response.status_code
+                    try:
+                        error = e.response.json()
+                    except ValueError:
+                        pass
+                results.extend((status, error) for _ in chunk)
+        return results
+
+    def log_stats(self):
+        with self.lock:
+            latencies = {endpoint: Counter(histogram) for endpoint, histogram in self.latencies.items()}
+        for endpoint, histogram in sorted(latencies.items()):
+            total_seconds = histogram.pop("total_seconds")
+            calls = sum(histogram.values())
+            buckets = ", ".join(f"<={bound}s: {histogram[bound]}" for bound in (*WP_LATENCY_BUCKETS, math.inf) if histogram[bound])
+            logger.info(f"WordPress {endpoint}: {calls} calls, mean {total_seconds / calls:.2f}s ({buckets})")
+
+wordpress = WordPressClient()
+scrape_session = create_scrape_session()
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+def _host_slot(url):
+    host = urlparse(url).netloc.lower()
+    with _host_slots_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(SCRAPE_PER_HOST_CONCURRENCY)
+        return _host_slots[host]
+
+def fetch(url, timeout=10, **kwargs):
+    """GET url on the shared session, holding one of its host's concurrency slots."""
+    with _host_slot(url):
+        return scrape_session.get(url, timeout=timeout, **kwargs)
+
+def head(url, timeout=10, **kwargs):
+    """HEAD url on the shared session, holding one of its host's concurrency slots."""
+    with _host_slot(url):
+        return scrape_session.head(url, timeout=timeout, **kwargs)
+
+class HttpCache:
+    """Per-URL validators, body hash and parsed result, so unchanged pages are neither re-sent nor re-parsed.
+
+    Requests carry If-None-Match / If-Modified-Since from the last response. A 304, or a
+    200 whose body hashes the same as before, returns the previous parse. Within `ttl`
+    seconds of the last fetch the parse is reused without any request at all.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.url_locks = {}
+        self.stats = Counter()
+
+    def get_parsed(self, url, parse, ttl=0):
+        """Return parse(html) for url, fetching conditionally and parsing only when the body changed."""
+        # One fetch per URL at a time, so concurrent jobs of one company share a single request.
+        # A URL's lock (and its waiter count) only lives while someone holds or waits for it.
+        with self.lock:
+            lock, users = self.url_locks.get(url, (threading.Lock(), 0))
+            self.url_locks[url] = (lock, users + 1)
+        try:
+            with lock:
+                return self._get_parsed(url, parse, ttl)
+        finally:
+            with self.lock:
+                lock, users = self.url_locks.pop(url)
+                if users > 1:
+                    self.url_locks[url] = (lock, users - 1)
+
+    def _get_parsed(self, url, parse, ttl):
+        entry = self.entries.get(url)
+        if entry and time.time() - entry["fetched_at"] < ttl:
+            self.stats["fresh"] += 1
+            return copy.deepcopy(entry["parsed"])
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        response = fetch(url, headers=headers)
+        if response.status_code == 304 and entry:
+            self.stats["not_modified"] += 1
+            entry["fetched_at"] = time.time()
+            return copy.deepcopy(entry["parsed"])
+        response.raise_for_status()
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        if entry and entry["body_hash"] == body_hash:
+            self.stats["unchanged"] += 1
+            parsed = entry["parsed"]
+        else:
+            self.stats["parsed"] += 1
+            parsed = parse(response.text)
+        self.entries[url] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body_hash": body_hash,
+            "parsed": parsed,
+            "fetched_at": time.time(),
+        }
+        return copy.deepcopy(parsed)
+
+    def log_stats(self):
+        logger.info(
+            f"HTTP cache: {self.stats['parsed']} parsed, {self.stats['not_modified']} not modified, "
+            f"{self.stats['unchanged']} unchanged bodies, {self.stats['fresh']} served within TTL"
+        )
+
+http_cache = HttpCache()
+
+class UrlResolver:
+    """Follows application and company links to their final URL, remembering the answer on disk.
+
+    Redirects are followed with HEAD, falling back to a streamed GET that is closed before
+    the body is read. Final URLs are stored unstripped for URL_CACHE_TTL seconds (failures
+    for URL_CACHE_FAILURE_TTL) and TRACKING_PARAMS are removed when they are returned.
+    """
+
+    def __init__(self, path=URL_CACHE_FILE, ttl=URL_CACHE_TTL, failure_ttl=URL_CACHE_FAILURE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.conn = None
+        try:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS resolved_urls (url TEXT PRIMARY KEY, final_url TEXT, ok INTEGER, resolved_at REAL)"
+            )
+            now = time.time()
+            self.conn.execute(
+                "DELETE FROM resolved_urls WHERE (ok = 1 AND resolved_at < ?) OR (ok = 0 AND resolved_at < ?)",
+                (now - ttl, now - failure_ttl)
+            )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"URL cache unavailable at {path}: {str(e)}")
+            self.conn = None
+
+    @staticmethod
+    def strip_tracking(url):
+        parsed_url = urlparse(url)
         query_params = parse_qs(parsed_url.query)
-        query_params.pop('utm_source', None)
+        for param in TRACKING_PARAMS:
+            query_params.pop(param, None)
         cleaned_query = urlencode(query_params, doseq=True)
-        cleaned_url = urlunparse((
+        return urlunparse((
             parsed_url.scheme,
             parsed_url.netloc,
             parsed_url.path,
@@ -926,27 +2342,90 @@ def clean_application_url(url):
             cleaned_query,
             parsed_url.fragment
         ))
+
+    def _lookup(self, url):
+        if self.conn is None:
+            return None
+        with self.lock:
+            try:
+                row = self.conn.execute("SELECT final_url, ok, resolved_at FROM resolved_urls WHERE url = ?", (url,)).fetchone()
+            except sqlite3.Error as e:
+                logger.error(f"URL cache lookup failed: {str(e)}")
+                return None
+        if row is None or time.time() - row[2] >= (self.ttl if row[1] else self.failure_ttl):
+            return None
+        return row
+
+    def _store(self, url, final_url, ok):
+        if self.conn is None:
+            return
+        with self.lock:
+            try:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO resolved_urls (url, final_url, ok, resolved_at) VALUES (?, ?, ?, ?)",
+                    (url, final_url, int(ok), time.time())
+                )
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"URL cache store failed: {str(e)}")
+
+    def _follow(self, url):
+        try:
+            response = head(url, allow_redirects=True)
+            if response.status_code < 400:
+                self.stats["head"] += 1
+                return response.url
+        except RequestException as e:
+            logger.debug(f"HEAD failed for {url}, retrying with GET: {str(e)}")
+        # Some servers reject HEAD; stream the GET and close it before the body is downloaded
+        with fetch(url, allow_redirects=True, stream=True) as response:
+            response.raise_for_status()
+            self.stats["get"] += 1
+            return response.url
+
+    def resolve(self, url):
+        """Return url's final, tracking-free location, or url itself if it cannot be resolved."""
+        if not url:
+            return url
+        cached = self._lookup(url)
+        if cached is not None:
+            self.stats["hits"] += 1
+            final_url, ok, _ = cached
+            return self.strip_tracking(final_url) if ok else url
+        try:
+            final_url = self._follow(url)
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Error processing application URL {url}: {str(e)}")
+            self._store(url, url, False)
+            return url
+        self._store(url, final_url, True)
+        cleaned_url = self.strip_tracking(final_url)
         logger.debug(f"Cleaned application URL: {final_url} -> {cleaned_url}")
         return cleaned_url
-    except Exception as e:
-        logger.error(f"Error processing application URL {url}: {str(e)}")
-        return url
 
-def upload_logo_to_media_library(logo_url, auth, headers):
+    def log_stats(self):
+        logger.info(
+            f"URL resolver: {self.stats['hits']} cache hits, {self.stats['head']} resolved by HEAD, "
+            f"{self.stats['get']} by streamed GET, {self.stats['failed']} failed"
+        )
+
+def get_url_resolver():
+    return _lazy_resource("URL cache", UrlResolver)
+
+def clean_application_url(url):
+    return get_url_resolver().resolve(url)
+
+def upload_logo_to_media_library(logo_url):
     if not logo_url or not logo_url.startswith('http') or not (logo_url.lower().endswith('.png') or logo_url.lower().endswith('.jpg') or logo_url.lower().endswith('.jpeg')):
         logger.warning(f"Invalid logo URL or format: {logo_url}")
         return None
     try:
-        response = requests.get(logo_url, headers=HEADERS, timeout=10)
+        response = fetch(logo_url)
         response.raise_for_status()
         content_type = response.headers.get('content-type', 'image/jpeg')
         filename = logo_url.split('/')[-1] or 'company_logo.jpg'
-        media_headers = headers.copy()
-        media_headers['Content-Disposition'] = f'attachment; filename={filename}'
-        media_headers['Content-Type'] = content_type
-        response = requests.post(WP_MEDIA_URL, headers=media_headers, data=response.content, auth=(WP_USERNAME, WP_APP_PASSWORD), timeout=10, verify=False)
-        response.raise_for_status()
-        media = response.json()
+        media = wordpress.upload_media(response.content, filename, content_type)
         attachment_id = media.get('id')
         logger.info(f"Uploaded logo {logo_url} to media library, Attachment ID: {attachment_id}")
         return attachment_id
@@ -987,28 +2466,21 @@ def extract_job_title(job_title):
     logger.debug(f"No pattern matched, using fallback extracted title: {extracted}")
     return extracted
 
+def normalize_paraphrase(text):
+    """Remove verbose model phrases and normalize whitespace, without a grammar pass."""
+    text = MARKUP_RE.sub('', VERBOSE_OUTPUT_RE.sub('', text))
+    text = SPACES_RE.sub(' ', text)
+    return BLANK_LINES_RE.sub('\n\n', text).strip()
+
+def correct_grammar(text):
+    """Apply LanguageTool's suggested corrections to text."""
+    return grammar_service.check(text)[0]
+
 def clean_description(text):
     """Clean paraphrased text by removing verbose phrases and normalizing."""
-    verbose_phrases = [
-        r'Paraphrased Version',
-        r'Paraphrased Job Description for',
-        r'This paraphrased version maintains the original content while improving clarity and readability\.'
-    ]
-    for phrase in verbose_phrases:
-        text = re.sub(phrase, '', text, flags=re.IGNORECASE).strip()
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = re.sub(r'\*\*', '', text)
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text).strip()
-    text = re.sub(r'[\r\t\f\v]', '', text)
-    try:
-        matches = tool.check(text)
-        corrected_text = language_tool_python.utils.correct(text, matches)
-        return corrected_text
-    except Exception as e:
-        logger.error(f"Error in grammar correction: {str(e)}")
-        return text
+    return correct_grammar(normalize_paraphrase(text))
 
-def print_word_by_word(text, delay=0.05):
+def print_word_by_word(text):
     text = re.sub(r'\*\*', '', text)
     print("\nStep 3: API Response (Word-by-Word)")
     print("-" * 30)
@@ -1018,11 +2490,15 @@ def print_word_by_word(text, delay=0.05):
         words = para.split()
         for word in words:
             print(f"{word} ", end="", flush=True)
-        time.sleep(delay)
         print('\n')
     return text
 
-def paraphrase_title_and_description(title, description, index, max_attempts=5):
+def paraphrase_title_and_description(title, description, index, max_attempts=5, paraphrased=None):
+    """Paraphrase and tidy a job's title and description.
+
+    `paraphrased` takes a (title, description) pair already produced by paraphrase_page_jobs;
+    without it the title and description paragraphs are generated here in one batched pass.
+    """
     print(f"\n=== Processing Article #{index + 1} ===")
     print("Step 1: Original Article Text")
     print("-" * 30)
@@ -1032,10 +2508,17 @@ def paraphrase_title_and_description(title, description, index, max_attempts=5):
     print("\nStep 2: Paraphrasing Title and Description Separately")
     print("-" * 30)
 
+    if paraphrased is None:
+        title_result, description_result = run_task_groups([
+            [(_paraphrase_title_task(title, max_attempts=max_attempts), title)],
+            paragraph_paraphrase_tasks(description, "job description", DESCRIPTION_PROMPT_MATCHER, max_attempts=max_attempts)
+        ])
+        paraphrased = (title_result[0], "\n\n".join(description_result) or description)
+
     # Paraphrase the title
     try:
         print(f"Paraphrasing Job Title: {title}")
-        paraphrased_title = paraphrase_strict_title(title, max_attempts=max_attempts)
+        paraphrased_title = paraphrased[0]
         logger.debug(f"Raw paraphrased title: {paraphrased_title}")
         print(f"Paraphrased Job Title: {paraphrased_title}")
 
@@ -1058,7 +2541,7 @@ def paraphrase_title_and_description(title, description, index, max_attempts=5):
     # Paraphrase the description
     try:
         print(f"Paraphrasing Job Description: {description}")
-        paraphrased_description = paraphrase_strict_description(description, max_attempts=max_attempts)
+        paraphrased_description = paraphrased[1]
         logger.debug(f"Raw paraphrased description: {paraphrased_description}")
         print(f"Paraphrased Job Description: {paraphrased_description}")
         rewritten_description = clean_description(paraphrased_description)
@@ -1075,78 +2558,120 @@ def paraphrase_title_and_description(title, description, index, max_attempts=5):
 
     return print_word_by_word(f"Job Title: {rewritten_title}\n\nJob Description:\n{rewritten_description}"), rewritten_title, rewritten_description
 
-def get_region_term_id(location_value, auth, headers):
-    taxonomy_url = "https://kenya.mimusjobs.com/wp-json/wp/v2/job_listing_region"
-    location_slug = location_value.lower().replace(' ', '-')
-    try:
-        response = requests.get(f"{taxonomy_url}?slug={location_slug}", headers=headers, timeout=10, verify=False)
-        response.raise_for_status()
-        terms = response.json()
-        if terms:
-            logger.debug(f"Found existing region term: {terms[0]['id']} for {location_value}")
-            return terms[0]['id']
-    except RequestException as e:
-        logger.error(f"Error fetching region term for {location_value}: {str(e)}")
-    try:
-        term_data = {"name": location_value, "slug": location_slug}
-        response = requests.post(taxonomy_url, json=term_data, headers=headers, auth=(WP_USERNAME, WP_APP_PASSWORD), timeout=10, verify=False)
-        response.raise_for_status()
-        term = response.json()
-        logger.debug(f"Created new region term: {term['id']} for {location_value}")
-        return term['id']
-    except RequestException as e:
-        logger.error(f"Error creating region term for {location_value}: {str(e)}")
-        return None
+def wp_slug(text):
+    """The slug WordPress derives from a title or term name (its sanitize_title, for ASCII text)."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"<[^>]*>", "", text).lower()
+    text = re.sub(r"&.+?;", "", text).replace(".", "-")
+    text = re.sub(r"[^a-z0-9 _-]", "", text)
+    return re.sub(r"[\s-]+", "-", text).strip("-")
+
+class WordPressEntityCache:
+    """Slug -> ID maps for the job region/type taxonomies and the company posts.
+
+    Each map is filled by one paginated bulk GET the first time it is needed in a cycle,
+    then lookups are local. Missing terms are created on demand and written through, so
+    a job costs no taxonomy or company-slug round-trips once its terms exist. Lookup slugs
+    go through wp_slug, so they match the sanitized slugs WordPress returns; a company
+    that still misses is looked up by slug on the server before it is reported missing.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.maps = {}
+        self.stats = Counter()
+
+    def reset(self):
+        """Drop everything, so the next lookup reloads what other writers may have added."""
+        with self.lock:
+            self.maps = {}
+
+    def _map(self, url, fields="id,slug"):
+        # Called with self.lock held; a failed preload is retried on the next lookup
+        if url not in self.maps:
+            self.maps[url] = {item["slug"]: item for item in wordpress.list_all(url, fields)}
+            self.stats["preloads"] += 1
+            logger.info(f"Preloaded {len(self.maps[url])} entries from {url}")
+        return self.maps[url]
+
+    def term_id(self, taxonomy_url, name, slug):
+        """ID of the term with this slug, creating it if it does not exist yet."""
+        slug = wp_slug(slug)
+        with self.lock:
+            try:
+                terms = self._map(taxonomy_url)
+            except (RequestException, ValueError) as e:
+                logger.error(f"Error preloading terms from {taxonomy_url}: {str(e)}")
+                terms = {}
+            if slug in terms:
+                self.stats["hits"] += 1
+                return terms[slug]["id"]
+            try:
+                # A slug WordPress normalizes to an existing term comes back as that term's ID
+                term_id = wordpress.create_term(taxonomy_url, name, slug)
+            except (RequestException, ValueError, KeyError) as e:
+                logger.error(f"Error creating term {name} at {taxonomy_url}: {str(e)}")
+                return None
+            self.stats["created"] += 1
+            terms[slug] = {"id": term_id, "slug": slug}
+            logger.debug(f"Created or matched term {term_id} for {name} at {taxonomy_url}")
+            return term_id
+
+    def company(self, slug):
+        """(id, link) of the company post with this slug, or None."""
+        slug = wp_slug(slug)
+        with self.lock:
+            try:
+                companies = self._map(WP_COMPANY_URL, "id,slug,link")
+            except (RequestException, ValueError) as e:
+                logger.error(f"Error preloading companies: {str(e)}")
+                return None
+            company = companies.get(slug)
+            self.stats["hits" if company else "misses"] += 1
+            if not company:
+                # WordPress sanitizes ?slug= itself, which catches names wp_slug does not (non-ASCII)
+                try:
+                    found = wordpress.find_by_slug(WP_COMPANY_URL, slug)
+                except (RequestException, ValueError) as e:
+                    logger.warning(f"Error checking for existing company {slug}: {str(e)}")
+                    found = []
+                if found:
+                    company = found[0]
+                    companies[slug] = company
+        return (company["id"], company["link"]) if company else None
+
+    def add_company(self, slug, post_id, link):
+        slug = wp_slug(slug)
+        with self.lock:
+            if WP_COMPANY_URL in self.maps:
+                self.maps[WP_COMPANY_URL][slug] = {"id": post_id, "slug": slug, "link": link}
+
+    def log_stats(self):
+        logger.info(
+            f"WordPress entity cache: {self.stats['hits']} local hits, {self.stats['misses']} misses, "
+            f"{self.stats['created']} terms created, {self.stats['preloads']} collections preloaded"
+        )
 
-def get_job_type_term_id(job_type_value, auth, headers):
-    taxonomy_url = "https://kenya.mimusjobs.com/wp-json/wp/v2/job_listing_type"
-    job_type_slug = job_type_value.lower().replace(' ', '-')
-    try:
-        response = requests.get(f"{taxonomy_url}?slug={job_type_slug}", headers=headers, timeout=10, verify=False)
-        response.raise_for_status()
-        terms = response.json()
-        if terms:
-            logger.debug(f"Found existing job type term: {terms[0]['id']} for {job_type_value}")
-            return terms[0]['id']
-    except RequestException as e:
-        logger.error(f"Error fetching job type term for {job_type_value}: {str(e)}")
-    try:
-        term_data = {"name": job_type_value, "slug": job_type_slug}
-        response = requests.post(taxonomy_url, json=term_data, headers=headers, auth=(WP_USERNAME, WP_APP_PASSWORD), timeout=10, verify=False)
-        response.raise_for_status()
-        term = response.json()
-        logger.debug(f"Created new job type term: {term['id']} for {job_type_value}")
-        return term['id']
-    except RequestException as e:
-        logger.error(f"Error creating job type term for {job_type_value}: {str(e)}")
-        return None
+wp_entity_cache = WordPressEntityCache()
+
+def get_region_term_id(location_value):
+    return wp_entity_cache.term_id(WP_REGION_URL, location_value, location_value.lower().replace(' ', '-'))
 
-def initialize_job_type_terms(auth, headers):
-    taxonomy_url = "https://kenya.mimusjobs.com/wp-json/wp/v2/job_listing_type"
+def get_job_type_term_id(job_type_value):
+    return wp_entity_cache.term_id(WP_JOB_TYPE_URL, job_type_value, job_type_value.lower().replace(' ', '-'))
+
+def initialize_job_type_terms():
     for job_type, slug in JOB_TYPE_MAPPING.items():
-        try:
-            response = requests.get(f"{taxonomy_url}?slug={slug}", headers=headers, timeout=10, verify=False)
-            response.raise_for_status()
-            terms = response.json()
-            if not terms:
-                term_data = {"name": job_type, "slug": slug}
-                response = requests.post(taxonomy_url, json=term_data, headers=headers, auth=(WP_USERNAME, WP_APP_PASSWORD), timeout=10, verify=False)
-                response.raise_for_status()
-                term = response.json()
-                logger.info(f"Initialized job type term: {term['id']} for {job_type}")
-        except RequestException as e:
-            logger.error(f"Error initializing job type term {job_type}: {str(e)}")
+        wp_entity_cache.term_id(WP_JOB_TYPE_URL, job_type, slug)
 
-def save_company_to_wordpress(index, company_data):
-    auth_string = f"{WP_USERNAME}:{WP_APP_PASSWORD}"
-    auth = base64.b64encode(auth_string.encode()).decode()
-    headers = {"Authorization": f"Basic {auth}", "Content-Type": "application/json"}
+def build_company_post(company_data, paraphrased=None):
+    """The company post payload: logo uploaded, details and tagline paraphrased and cleaned."""
     company_name = sanitize_text(company_data.get("company_name", "Unknown Company"))
     logo_url = sanitize_text(company_data.get("company_logo", []), is_url=True)
     logo_url = logo_url[0] if isinstance(logo_url, list) and logo_url else ""
     attachment_id = None
     if logo_url:
-        attachment_id = upload_logo_to_media_library(logo_url, auth, headers)
+        attachment_id = upload_logo_to_media_library(logo_url)
     else:
         logger.info(f"No valid logo URL for company {company_name}. Skipping logo upload.")
     company_details = company_data.get("company_details", "")
@@ -1154,10 +2679,11 @@ def save_company_to_wordpress(index, company_data):
         print(f"\nParaphrasing Company Details for {company_name}")
         print("-" * 30)
         print(f"Original Company Details: {company_details}")
-        paraphrased_details = paraphrase_strict_company(company_details, max_attempts=5)
+        paraphrased_details = paraphrased[0] if paraphrased else paraphrase_strict_company(company_details, max_attempts=5)
 
         paraphrased_details = re.sub(r'Job Title:\s*[^\n]*\n*', '', paraphrased_details, flags=re.IGNORECASE)
         paraphrased_details = re.sub(r'Job Description:\s*', '', paraphrased_details, flags=re.IGNORECASE)
+        ensure_nltk_data()
         sentences = nltk.sent_tokenize(paraphrased_details)
         paragraphs = []
         current_paragraph = []
@@ -1182,7 +2708,7 @@ def save_company_to_wordpress(index, company_data):
         print(f"\nParaphrasing Company Tagline for {company_name}")
         print("-" * 30)
         print(f"Original Company Tagline: {company_tagline}")
-        paraphrased_tagline = paraphrase_strict_tagline(company_tagline, max_attempts=5)
+        paraphrased_tagline = paraphrased[1] if paraphrased else paraphrase_strict_tagline(company_tagline, max_attempts=5)
         paraphrased_tagline = re.sub(r'Job Title:\s*[^\n]*\n*', '', paraphrased_tagline, flags=re.IGNORECASE)
         paraphrased_tagline = re.sub(r'Job Description:\s*', '', paraphrased_tagline, flags=re.IGNORECASE)
         print(f"Paraphrased Company Tagline: {paraphrased_tagline}")
@@ -1190,21 +2716,7 @@ def save_company_to_wordpress(index, company_data):
     else:
         logger.warning(f"No company tagline to paraphrase for {company_name}")
         company_tagline = ""
-    check_url = f"{WP_COMPANY_URL}?slug={company_name.lower().replace(' ', '-')}"
-    session = requests.Session()
-    retries = Retry(total=3, backoff_factor=2, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET", "POST"])
-    session.mount("https://", HTTPAdapter(max_retries=retries))
-    try:
-        response = session.get(check_url, headers=headers, timeout=10, verify=False)
-        response.raise_for_status()
-        posts = response.json()
-        if posts:
-            post = posts[0]
-            logger.info(f"Company {company_name} already exists: Post ID {post.get('id')}, URL {post.get('link')}")
-            return post.get("id"), post.get("link")
-    except RequestException as e:
-        logger.warning(f"Error checking for existing company {company_name}: {str(e)}. Proceeding to create new company.")
-    post_data = {
+    return {
         "title": company_name,
         "content": company_details,
         "status": "publish",
@@ -1220,62 +2732,52 @@ def save_company_to_wordpress(index, company_data):
             "_company_tagline": company_tagline
         }
     }
+
+def save_company_to_wordpress(index, company_data, paraphrased=None):
+    company_name = sanitize_text(company_data.get("company_name", "Unknown Company"))
+    post_data = build_company_post(company_data, paraphrased)
+    company_slug = wp_slug(company_name)
+    existing = wp_entity_cache.company(company_slug)
+    if existing:
+        logger.info(f"Company {company_name} already exists: Post ID {existing[0]}, URL {existing[1]}")
+        return existing
     logger.debug(f"Sending company payload to WordPress for company {company_name}: {json.dumps(post_data, indent=2)}")
     try:
-        response = session.post(WP_COMPANY_URL, json=post_data, headers=headers, timeout=15, verify=False)
-        response.raise_for_status()
-        post = response.json()
+        post = wordpress.create_company(post_data)
+        wp_entity_cache.add_company(company_slug, post.get("id"), post.get("link"))
         logger.info(f"Successfully posted company {company_name} to WordPress: Post ID {post.get('id')}, URL {post.get('link')}")
         print(f"\nStep 5: Published Company to WordPress")
         print("-" * 30)
         print(f"Company Post ID: {post.get('id')}")
         print(f"Company Post URL: {post.get('link')}")
         return post.get("id"), post.get("link")
-    except RequestException as e:
+    except (RequestException, ValueError) as e:
         logger.error(f"Failed to post company {company_name}: {str(e)}")
         print(f"Error publishing company {company_name}: {e}")
         return None, None
 
-def save_article_to_wordpress(index, job_data, rewritten_title, rewritten_description, application):
-    auth_string = f"{WP_USERNAME}:{WP_APP_PASSWORD}"
-    auth = base64.b64encode(auth_string.encode()).decode()
-    headers = {
-        "Authorization": f"Basic {auth}",
-        "Content-Type": "application/json"
-    }
-    initialize_job_type_terms(auth, headers)
+def job_title_slug(index, job_data, rewritten_title):
+    if rewritten_title and not rewritten_title.startswith("Error:"):
+        return wp_slug(rewritten_title)
+    return wp_slug(sanitize_text(job_data.get("Job Title", f"job-listing-{index + 1}")))
+
+def build_job_post(index, job_data, rewritten_title, rewritten_description, application):
+    """The job listing payload: logo uploaded and region/job type terms resolved."""
+    initialize_job_type_terms()
     location_value = sanitize_text(job_data.get("Location", "Remote"))
     job_type_value = sanitize_text(job_data.get("Job Type", "Full-time"))
     job_type_slug = JOB_TYPE_MAPPING.get(job_type_value, "full-time").lower()
     logo_url = sanitize_text(job_data.get("Company Logo", ""), is_url=True)
     company_name = sanitize_text(job_data.get("Company", "Unknown Company"))
     job_id = str(job_data.get("Job ID", ""))
-    job_url = sanitize_text(job_data.get("Job URL", ""), is_url=True)
     is_email = validate_application_method(application, is_email=True)
     is_url = validate_application_method(application, is_email=False)
     if not (is_email or is_url):
         logger.warning(f"Invalid application method for job {index + 1} (Job ID: {job_id}): {application}. Setting to empty.")
         application = ""
-    title_slug = rewritten_title.lower().replace(' ', '-') if rewritten_title and not rewritten_title.startswith("Error:") else sanitize_text(job_data.get("Job Title", f"job-listing-{index + 1}")).lower().replace(' ', '-')
-    check_url = f"{WP_URL}?slug={title_slug}"
-    session = requests.Session()
-    retries = Retry(total=0, backoff_factor=2, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
-    session.mount("https://", HTTPAdapter(max_retries=retries))
-    try:
-        response = session.get(check_url, headers=headers, timeout=10, verify=False)
-        response.raise_for_status()
-        posts = response.json()
-        if posts:
-            post = posts[0]
-            logger.info(f"Job {index + 1} (Job ID: {job_id}) already exists in WordPress: Post ID {post.get('id')}, URL {post.get('link')}")
-            print(f"Skipping job {index + 1}: Already exists in WordPress with Post ID {post.get('id')}, URL {post.get('link')}")
-            save_processed_job_id(job_id, job_url, company_name)
-            return post.get("id"), post.get("link")
-    except RequestException as e:
-        logger.warning(f"Error checking for existing job {index + 1}: {str(e)}. Proceeding to create new post.")
-    attachment_id = upload_logo_to_media_library(logo_url, auth, headers)
-    region_term_id = get_region_term_id(location_value, auth, headers)
-    job_type_term_id = get_job_type_term_id(job_type_value, auth, headers)
+    attachment_id = upload_logo_to_media_library(logo_url)
+    region_term_id = get_region_term_id(location_value)
+    job_type_term_id = get_job_type_term_id(job_type_value)
     if company_name == "Unknown Company":
         logger.warning(f"Using fallback company name 'Unknown Company' for job {index + 1}")
     post_data = {
@@ -1305,42 +2807,58 @@ def save_article_to_wordpress(index, job_data, rewritten_title, rewritten_descri
         post_data["job_listing_region"] = [region_term_id]
     if job_type_term_id:
         post_data["job_listing_type"] = [job_type_term_id]
+    return post_data
+
+def save_article_to_wordpress(index, job_data, rewritten_title, rewritten_description, application, post_data=None):
+    company_name = sanitize_text(job_data.get("Company", "Unknown Company"))
+    job_id = str(job_data.get("Job ID", ""))
+    job_url = sanitize_text(job_data.get("Job URL", ""), is_url=True)
+    title_slug = job_title_slug(index, job_data, rewritten_title)
+    try:
+        posts = wordpress.find_by_slug(WP_URL, title_slug)
+        if posts:
+            post = posts[0]
+            logger.info(f"Job {index + 1} (Job ID: {job_id}) already exists in WordPress: Post ID {post.get('id')}, URL {post.get('link')}")
+            print(f"Skipping job {index + 1}: Already exists in WordPress with Post ID {post.get('id')}, URL {post.get('link')}")
+            save_processed_job_id(job_id, job_url, company_name, job_data.get('URL Page', ''), job_data.get('Job Number', ''))
+            return post.get("id"), post.get("link")
+    except (RequestException, ValueError) as e:
+        logger.warning(f"Error checking for existing job {index + 1}: {str(e)}. Proceeding to create new post.")
+    if post_data is None:
+        post_data = build_job_post(index, job_data, rewritten_title, rewritten_description, application)
     logger.debug(f"Sending job payload to WordPress for job {index + 1}: {json.dumps(post_data, indent=2)}")
     max_retries = 3
     for attempt in range(max_retries):
         response = None
         try:
-            response = session.post(WP_URL, json=post_data, headers=headers, timeout=15, verify=False)
-            response.raise_for_status()
-            post = response.json()
+            post = wordpress.create_post(post_data)
             logger.info(f"Successfully posted job {index + 1} to WordPress: Post ID {post.get('id')}, URL {post.get('link')}")
             print(f"\nStep 4: Published Job to WordPress")
             print("-" * 30)
             print(f"Job Post ID: {post.get('id')}")
             print(f"Job Post URL: {post.get('link')}")
-            save_processed_job_id(job_id, job_url, company_name)
+            save_processed_job_id(job_id, job_url, company_name, job_data.get('URL Page', ''), job_data.get('Job Number', ''))
             return post.get("id"), post.get("link")
         except RequestException as e:
-            logger.error(f"Attempt {attempt + 1} failed for job {index + 1}: {e}, Status: {response.status_code if response else 'None'}, Response: {response.text if response else 'None'}")
+            response = e.response
+            logger.error(f"Attempt {attempt + 1} failed for job {index + 1}: {e}, Status: {response.status_code if response is not None else 'None'}, Response: {response.text if response is not None else 'None'}")
             print(f"\nStep 4: Attempt {attempt + 1} failed for job {index + 1}: {e}")
-            print(f"Response: {response.text if response else 'No response'}")
-            print(f"Status Code: {response.status_code if response else 'No status code'}")
-            print(f"Response Headers: {response.headers if response else 'No headers'}")
+            print(f"Response: {response.text if response is not None else 'No response'}")
+            print(f"Status Code: {response.status_code if response is not None else 'No status code'}")
+            print(f"Response Headers: {response.headers if response is not None else 'No headers'}")
             try:
-                check_response = session.get(check_url, headers=headers, timeout=10, verify=False)
-                if check_response.status_code == 200:
-                    posts = check_response.json()
-                    if posts:
-                        post = posts[0]
-                        logger.info(f"Job {index + 1} (Job ID: {job_id}) was created despite error: Post ID {post.get('id')}, URL {post.get('link')}")
-                        print(f"Job {index + 1} was created despite error: Post ID {post.get('id')}, URL {post.get('link')}")
-                        save_processed_job_id(job_id, job_url, company_name)
-                        return post.get("id"), post.get("link")
-            except RequestException as check_e:
+                posts = wordpress.find_by_slug(WP_URL, title_slug)
+                if posts:
+                    post = posts[0]
+                    logger.info(f"Job {index + 1} (Job ID: {job_id}) was created despite error: Post ID {post.get('id')}, URL {post.get('link')}")
+                    print(f"Job {index + 1} was created despite error: Post ID {post.get('id')}, URL {post.get('link')}")
+                    save_processed_job_id(job_id, job_url, company_name, job_data.get('URL Page', ''), job_data.get('Job Number', ''))
+                    return post.get("id"), post.get("link")
+            except (RequestException, ValueError) as check_e:
                 logger.error(f"Error checking for existing job after failed POST attempt {attempt + 1}: {check_e}")
             if attempt < max_retries - 1:
                 logger.info(f"Retrying job {index + 1} after {2 ** attempt} seconds...")
-                time.sleep(2 ** attempt)
+                idle_sleep(2 ** attempt, "wordpress retry")
     logger.error(f"Failed to post job {index + 1} after {max_retries} attempts.")
     print(f"Failed to post job {index + 1} after {max_retries} attempts.")
     return None, None
@@ -1356,53 +2874,149 @@ def add_three_months_to_date(date_str):
         print(f"Invalid date format: {date_str}")
         return None
 
+def compile_fields(table, many=()):
+    """Compile a {field: selector or (fallback selectors, ...)} table into {field: (compiled selectors, many)}."""
+    compiled = {}
+    for field, selectors in table.items():
+        if isinstance(selectors, str):
+            selectors = (selectors,)
+        compiled[field] = ([CSSSelector(selector) for selector in selectors], field in many)
+    return compiled
+
+def select_fields(tree, fields):
+    """Evaluate a compiled field table once over an lxml tree.
+
+    Single fields get the first element matched by their selectors (or None); `many`
+    fields get every match of their selector. Fallbacks are only tried when needed.
+    """
+    found = {}
+    for field, (selectors, many) in fields.items():
+        if many:
+            found[field] = selectors[0](tree)
+            continue
+        found[field] = None
+        for selector in selectors:
+            matches = selector(tree)
+            if matches:
+                found[field] = matches[0]
+                break
+    return found
+
+def element_text(element, default=""):
+    # lxml elements without children are falsy, so test against None
+    return element.text_content().strip() if element is not None else default
+
+# Field -> selector, or a tuple of fallback selectors tried in order; compiled once at import
+JOB_PAGE_FIELDS = compile_fields({
+    'title': ('h2.mag-b', 'h1'),
+    'company_name': ('#wrap-comp-jobs > div.company-jobs > h1', 'h1.company-name', 'div.company-info > h2'),
+    'job_type': '#printable > ul > li:nth-child(1) > span.jkey-info',
+    'job_qualifications': '#printable > ul > li:nth-child(2) > span.jkey-info',
+    'job_experiences': '#printable > ul > li:nth-child(3) > span.jkey-info',
+    'job_locations': 'ul.job-info > li:nth-child(4) > span.jkey-info',
+    'job_locations_printable': '#printable > ul > li:nth-child(4) > span.jkey-info',
+    'job_fields': '#printable > ul > li:nth-child(5) > span.jkey-info',
+    'date_posted': '#posted-date',
+    'deadline': 'div.read-left-section > ul > li.read-head > div > div:nth-child(2)',
+    'job_description': 'div.job-details',
+    'application_detail': '#printable > div.mag-b.bm-b-30 > p',
+    'application_text': ('#printable > div.mag-b.bm-b-30', 'div.application-details', 'div.job-apply'),
+    'application_url': ('#printable > div.mag-b.bm-b-30 > a', 'a.apply-button', 'a[href*="apply"]'),
+    'company_links': '#printable > a',
+}, many=('company_links',))
+
+COMPANY_PAGE_FIELDS = compile_fields({
+    'company_name': '#wrap-comp-jobs > div.company-jobs > h1',
+    'company_logo': '#wrap-comp-jobs > div.company-jobs > div.company-logo > img',
+    'company_industry': '#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(1) > span.comp-info-desc > a',
+    'company_founded': '#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(2) > span.comp-info-desc',
+    'company_type': '#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(3) > span.comp-info-desc',
+    'company_website_link': '#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(4) > span.comp-info-desc > a',
+    'company_website': '#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(4) > span.comp-info-desc',
+    'company_address': '#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(5) > span.comp-info-desc',
+    'company_details': '#wrap-comp-jobs > div.company-jobs > div.mag-b.fl-r.ts-13.tc-b6.bm-b-35',
+}, many=('company_logo',))
+
+LISTING_PAGE_FIELDS = compile_fields({'job_links': 'li.mag-b > h2 > a'}, many=('job_links',))
+
+def parse_job_page(html):
+    """Return the JOB_PAGE_FIELDS elements of a myjobmag job page."""
+    return select_fields(lxml.html.document_fromstring(html), JOB_PAGE_FIELDS)
+
+def parse_company_page(html, company_name=None):
+    """Parse a myjobmag company page into a company record; company_name is the fallback name."""
+    found = select_fields(lxml.html.document_fromstring(html), COMPANY_PAGE_FIELDS)
+    company_data = {}
+    company_data['company_name'] = element_text(found['company_name']).replace("Recruitment", "").strip() if found['company_name'] is not None else company_name
+    company_data['company_logo'] = ['https://www.myjobmag.co.ke' + img.get('src') for img in found['company_logo'] if img.get('src') and (img.get('src').lower().endswith('.png') or img.get('src').lower().endswith('.jpg') or img.get('src').lower().endswith('.jpeg'))]
+    company_data['company_industry'] = element_text(found['company_industry'])
+    company_data['company_founded'] = element_text(found['company_founded'])
+    company_data['company_type'] = element_text(found['company_type'])
+    company_website = ""
+    website_elem = found['company_website_link']
+    if website_elem is not None and website_elem.get('href'):
+        company_website = website_elem.get('href').strip()
+    else:
+        company_website = element_text(found['company_website'])
+    excluded_domains = ['mysalaryscale.com', 'myjobmag.co.ke', 'linkedin.com', 'twitter.com', 'facebook.com']
+    if company_website:
+        company_website = clean_application_url(company_website)
+        if any(domain in company_website.lower() for domain in excluded_domains):
+            company_website = ""
+        elif validate_application_method(company_website):
+            company_data['company_website'] = company_website
+        else:
+            company_website = ""
+    else:
+        company_website = ""
+    company_data['company_website'] = company_website
+    company_data['company_address'] = element_text(found['company_address'])
+    company_data['company_details'] = element_text(found['company_details'])
+    return company_data
+
 def scrape_job_details(job_url):
     try:
-        resp = requests.get(job_url, headers=HEADERS, timeout=10)
+        resp = fetch(job_url)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        job_title_elem = soup.select_one('h2.mag-b') or soup.select_one('h1')
-        job_title = job_title_elem.text.replace("Method of Application", "").strip() if job_title_elem else ""
+        found = parse_job_page(resp.text)
+        job_title = element_text(found['title']).replace("Method of Application", "").strip()
         parts = job_title.split(" at ")
         trimmed_parts = [part.strip() for part in parts]
         job_title_clean = trimmed_parts[0] if trimmed_parts else job_title
         company_name = trimmed_parts[1] if len(trimmed_parts) > 1 else None
         if not company_name:
-            company_name_elem = soup.select_one('#wrap-comp-jobs > div.company-jobs > h1') or soup.select_one('h1.company-name') or soup.select_one('div.company-info > h2')
-            company_name = company_name_elem.text.replace("Recruitment", "").strip() if company_name_elem else "Unknown Company"
-        job_type = soup.select_one('#printable > ul > li:nth-child(1) > span.jkey-info').text.strip() if soup.select_one('#printable > ul > li:nth-child(1) > span.jkey-info') else ""
-        job_qualifications = soup.select_one('#printable > ul > li:nth-child(2) > span.jkey-info').text.strip() if soup.select_one('#printable > ul > li:nth-child(2) > span.jkey-info') else ""
-        job_experiences = soup.select_one('#printable > ul > li:nth-child(3) > span.jkey-info').text.strip() if soup.select_one('#printable > ul > li:nth-child(3) > span.jkey-info') else ""
-        job_locations = soup.select_one('ul.job-info > li:nth-child(4) > span.jkey-info').text.strip() if soup.select_one('ul.job-info > li:nth-child(4) > span.jkey-info') else ""
+            company_name = element_text(found['company_name']).replace("Recruitment", "").strip() if found['company_name'] is not None else "Unknown Company"
+        job_type = element_text(found['job_type'])
+        job_qualifications = element_text(found['job_qualifications'])
+        job_experiences = element_text(found['job_experiences'])
+        job_locations = element_text(found['job_locations'])
         if not job_locations:
-            job_locations = soup.select_one('#printable > ul > li:nth-child(4) > span.jkey-info').text.strip() if soup.select_one('#printable > ul > li:nth-child(4) > span.jkey-info') else "Remote"
+            job_locations = element_text(found['job_locations_printable'], "Remote")
         logger.debug(f"Extracted location: {job_locations}")
-        job_fields = soup.select_one('#printable > ul > li:nth-child(5) > span.jkey-info').text.strip() if soup.select_one('#printable > ul > li:nth-child(5) > span.jkey-info') else ""
-        date_posted_str = soup.select_one('#posted-date').text.strip() if soup.select_one('#posted-date') else ""
+        job_fields = element_text(found['job_fields'])
+        date_posted_str = element_text(found['date_posted'])
         try:
             datetime.strptime(re.sub(r'^Posted:\s*', '', date_posted_str.strip()), '%b %d, %Y')
             new_date_string = add_three_months_to_date(date_posted_str)
         except ValueError:
             print(f"Invalid date format: {date_posted_str}")
             return None, None
-        deadline_elem = soup.select_one('div.read-left-section > ul > li.read-head > div > div:nth-child(2)')
-        deadline = deadline_elem.text.strip().replace("Deadline:", "").replace("Not specified", new_date_string).strip() if deadline_elem else new_date_string
-        job_description = soup.select_one('div.job-details').text.strip() if soup.select_one('div.job-details') else ""
-        application_detail = soup.select_one('#printable > div.mag-b.bm-b-30 > p').text.strip() if soup.select_one('#printable > div.mag-b.bm-b-30 > p') else ""
+        deadline = element_text(found['deadline']).replace("Deadline:", "").replace("Not specified", new_date_string).strip() if found['deadline'] is not None else new_date_string
+        job_description = element_text(found['job_description'])
+        application_detail = element_text(found['application_detail'])
         job_description = job_description + (f"\n\nApplication Instructions: {application_detail}" if application_detail else "")
         if company_name == "Unknown Company" and job_description:
             company_match = re.search(r'(?:at|for|with)\s+([A-Z][\w\s&-]+)\b', job_description, re.IGNORECASE)
             company_name = company_match.group(1).strip() if company_match else "Unknown Company"
         if company_name == "Unknown Company":
             logger.warning(f"Failed to extract company name for job URL: {job_url}")
-        application_text = soup.select_one('#printable > div.mag-b.bm-b-30') or soup.select_one('div.application-details') or soup.select_one('div.job-apply')
-        application_text = application_text.text.strip() if application_text else ""
+        application_text = element_text(found['application_text'])
         extracted_email = None
         if application_text:
             email_match = re.search(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', application_text)
             extracted_email = email_match.group(0) if email_match and validate_application_method(email_match.group(0), is_email=True) else ""
-        application_url_elem = soup.select_one('#printable > div.mag-b.bm-b-30 > a') or soup.select_one('a.apply-button') or soup.select_one('a[href*="apply"]')
-        application_url = application_url_elem.get('href', '') if application_url_elem else ""
+        application_url_elem = found['application_url']
+        application_url = application_url_elem.get('href', '') if application_url_elem is not None else ""
         if application_url:
             if application_url.startswith('/'):
                 application_url = 'https://www.myjobmag.co.ke' + application_url
@@ -1413,40 +3027,14 @@ def scrape_job_details(job_url):
         application = application_url if application_url else extracted_email if extracted_email else ""
         if not application:
             logger.warning(f"No valid application method extracted for job URL: {job_url}")
-        company_urls = ['https://www.myjobmag.co.ke' + a.get('href') for a in soup.select('#printable > a') if a.get('href')]
+        company_urls = ['https://www.myjobmag.co.ke' + a.get('href') for a in found['company_links'] if a.get('href')]
         company_data = {}
         if company_urls:
             try:
-                company_resp = requests.get(company_urls[0], headers=HEADERS, timeout=10)
-                company_resp.raise_for_status()
-                company_soup = BeautifulSoup(company_resp.text, 'html.parser')
-                company_data['company_name'] = company_soup.select_one('#wrap-comp-jobs > div.company-jobs > h1').text.replace("Recruitment", "").strip() if company_soup.select_one('#wrap-comp-jobs > div.company-jobs > h1') else company_name
-                company_data['company_logo'] = ['https://www.myjobmag.co.ke' + img.get('src') for img in company_soup.select('#wrap-comp-jobs > div.company-jobs > div.company-logo > img') if img.get('src') and (img.get('src').lower().endswith('.png') or img.get('src').lower().endswith('.jpg') or img.get('src').lower().endswith('.jpeg'))]
-                company_data['company_industry'] = company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(1) > span.comp-info-desc > a').text.strip() if company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(1) > span.comp-info-desc > a') else ""
-                company_data['company_founded'] = company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(2) > span.comp-info-desc').text.strip() if company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(2) > span.comp-info-desc') else ""
-                company_data['company_type'] = company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(3) > span.comp-info-desc').text.strip() if company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(3) > span.comp-info-desc') else ""
-                company_website = ""
-                website_elem = company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(4) > span.comp-info-desc > a')
-                if website_elem and website_elem.get('href'):
-                    company_website = website_elem.get('href').strip()
-                else:
-                    website_text_elem = company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(4) > span.comp-info-desc')
-                    if website_text_elem:
-                        company_website = website_text_elem.text.strip()
-                excluded_domains = ['mysalaryscale.com', 'myjobmag.co.ke', 'linkedin.com', 'twitter.com', 'facebook.com']
-                if company_website:
-                    company_website = clean_application_url(company_website)
-                    if any(domain in company_website.lower() for domain in excluded_domains):
-                        company_website = ""
-                    elif validate_application_method(company_website):
-                        company_data['company_website'] = company_website
-                    else:
-                        company_website = ""
-                else:
-                    company_website = ""
-                company_data['company_website'] = company_website
-                company_data['company_address'] = company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(5) > span.comp-info-desc').text.strip() if company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.company-details-right > ul > li:nth-child(5) > span.comp-info-desc') else ""
-                company_data['company_details'] = company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.mag-b.fl-r.ts-13.tc-b6.bm-b-35').text.strip() if company_soup.select_one('#wrap-comp-jobs > div.company-jobs > div.mag-b.fl-r.ts-13.tc-b6.bm-b-35') else ""
+                company_data = http_cache.get_parsed(company_urls[0], parse_company_page, ttl=COMPANY_CACHE_TTL)
+                # The cached parse is shared by every job of the company; the fallback name is this job's
+                if company_data['company_name'] is None:
+                    company_data['company_name'] = company_name
             except Exception as e:
                 print(f"Error fetching company details from {company_urls[0]}: {str(e)}")
                 logger.error(f"Error fetching company details from {company_urls[0]}: {str(e)}")
@@ -1460,7 +3048,7 @@ def scrape_job_details(job_url):
                     'company_address': "",
                     'company_details': ""
                 }
-        job_id = hashlib.md5(job_url.encode()).hexdigest()[:16]
+        job_id = job_id_for_url(job_url)
         return {
             'Job ID': job_id,
             'Job Title': job_title_clean,
@@ -1489,96 +3077,525 @@ def scrape_job_details(job_url):
         logger.error(f"Error scraping job details from {job_url}: {str(e)}")
         return None, None
 
-def crawl_and_process():
-    kenya_processed_job_ids, processed_job_urls, processed_companies = load_kenya_processed_job_ids()
-    print(f"Loaded {len(kenya_processed_job_ids)} previously processed Job IDs, {len(processed_job_urls)} URLs, and {len(processed_companies)} companies")
-    # Define the page range to scrape (pages 1 to 5)
-    for i in range(1, 6):
-        url = f'https://www.myjobmag.co.ke/page/{i}'
+def parse_listing_page(html):
+    found = select_fields(lxml.html.document_fromstring(html), LISTING_PAGE_FIELDS)
+    return ['https://www.myjobmag.co.ke' + a.get('href') for a in found['job_links'] if a.get('href')]
+
+def fetch_listing_page(page_number):
+    """Return the job URLs listed on one myjobmag listing page, re-parsing it only when it changed."""
+    return http_cache.get_parsed(f'https://www.myjobmag.co.ke/page/{page_number}', parse_listing_page)
+
+def submit_page_scrapes(pool, page_number, processed_job_urls, kenya_processed_job_ids):
+    """Fetch a listing page and queue a scrape of every job on it that was not processed before.
+
+    Returns the page's job URLs and a {future: (index, job_url)} map of the queued scrapes.
+    """
+    job_links = fetch_listing_page(page_number)
+    scrapes = {}
+    for index, job_url in enumerate(job_links):
+        if job_url in processed_job_urls or job_id_for_url(job_url) in kenya_processed_job_ids:
+            print(f"Skipping job {index + 1}: URL {job_url} already processed.")
+            continue
+        scrapes[pool.submit(scrape_job_details, job_url)] = (index, job_url)
+    return job_links, scrapes
+
+
+STAGE_DONE = object()  # sentinel telling a pipeline stage worker to drain and stop
+
+
+class StageQueue(queue.Queue):
+    """Bounded queue between two pipeline stages, recording depth and wait times.
+
+    A full queue blocks the upstream stage (backpressure); time spent blocked on put
+    and starved on get shows which stage limits the pipeline.
+    """
+
+    def __init__(self, name, maxsize=PIPELINE_QUEUE_SIZE):
+        super().__init__(maxsize)
+        self.name = name
+        self.max_depth = 0
+        self.depth_total = 0
+        self.samples = 0
+        self.put_wait = 0.0
+        self.get_wait = 0.0
+
+    def put(self, item, block=True, timeout=None):
+        start = time.time()
+        super().put(item, block, timeout)
+        self.put_wait += time.time() - start
+        self._sample()
+
+    def get(self, block=True, timeout=None):
+        start = time.time()
+        item = super().get(block, timeout)
+        self.get_wait += time.time() - start
+        self._sample()
+        return item
+
+    def _sample(self):
+        depth = self.qsize()
+        self.max_depth = max(self.max_depth, depth)
+        self.depth_total += depth
+        self.samples += 1
+
+    def log_stats(self):
+        logger.info(
+            f"Queue {self.name}: max depth {self.max_depth}/{self.maxsize}, "
+            f"mean depth {self.depth_total / max(self.samples, 1):.1f}, "
+            f"producers blocked {self.put_wait:.0f}s, consumers waited {self.get_wait:.0f}s"
+        )
+
+
+class PageProgress:
+    """Marks a listing page processed once it is scraped and every job queued from it is published."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.scraped = set()
+
+    def queued(self, page):
+        with self.lock:
+            self.pending[page] += 1
+
+    def scrape_done(self, page):
+        with self.lock:
+            self.scraped.add(page)
+            done = self.pending[page] == 0
+        if done:
+            save_last_processed_page(page)
+
+    def published(self, page):
+        with self.lock:
+            self.pending[page] -= 1
+            done = page in self.scraped and self.pending[page] == 0
+        if done:
+            save_last_processed_page(page)
+
+
+def scrape_stage(outbox, pages, kenya_processed_job_ids, processed_job_urls):
+    """Scrape listing pages 1-5 and queue every new, valid job as soon as its details arrive."""
+    with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as scrape_pool:
+        # Define the page range to scrape (pages 1 to 5)
+        for i in range(1, 6):
+            url = f'https://www.myjobmag.co.ke/page/{i}'
+            try:
+                job_links, scrapes = submit_page_scrapes(scrape_pool, i, processed_job_urls, kenya_processed_job_ids)
+                print(f"Collected {len(job_links)} job URLs from page {i}")
+                for future in as_completed(scrapes):
+                    index, job_url = scrapes[future]
+                    job_number = index + 1
+                    print(f"\nProcessing job {job_number} from page {i}: {job_url}")
+                    job_data, company_data = future.result()
+                    if not job_data or not company_data:
+                        print(f"Failed to scrape job details from {job_url}")
+                        continue
+                    job_data['URL Page'] = str(i)
+                    job_data['Job Number'] = str(job_number)
+                    print(f"\nRaw Scraped Data for Job {job_number} (Job ID: {job_data.get('Job ID', '')})")
+                    print("-" * 50)
+                    for key, value in job_data.items():
+                        print(f"{key}: {value}")
+                    print("-" * 50)
+                    job_id = str(job_data.get("Job ID", ""))
+                    job_title = job_data.get("Job Title", "")
+                    job_description = job_data.get("Job Description", "")
+                    if not job_id or pd.isna(job_id):
+                        print(f"Skipping job {job_number}: Empty or invalid Job ID.")
+                        continue
+                    if job_id in kenya_processed_job_ids:
+                        print(f"Skipping job {job_number}: Job ID {job_id} already processed.")
+                        continue
+                    if not job_title or pd.isna(job_title):
+                        print(f"Skipping job {job_number}: Empty or invalid job title.")
+                        continue
+                    if not job_description or pd.isna(job_description):
+                        print(f"Skipping job {job_number}: Empty or invalid job description.")
+                        continue
+                    pages.queued(i)
+                    outbox.put((i, index, job_data, company_data))
+            except Exception as e:
+                print(f"Error crawling page {url}: {str(e)}")
+                logger.error(f"Error crawling page {url}: {str(e)}")
+            pages.scrape_done(i)
+
+
+def run_stage(stage, inbox, *args):
+    """Thread target for a pipeline stage.
+
+    Should the stage die anyway, its inbox is drained to the end so the stage feeding it
+    never blocks on a full queue; the drained jobs are not recorded and are scraped again
+    next cycle.
+    """
+    try:
+        stage(inbox, *args)
+    except Exception as e:
+        logger.exception(f"Pipeline stage {stage.__name__} failed: {str(e)}. Discarding its queued jobs until the next cycle.")
+        while inbox.get() is not STAGE_DONE:
+            pass
+
+
+def paraphrase_stage(inbox, outbox, processed_companies):
+    """Paraphrase queued jobs, batching together whatever has arrived (up to PARAPHRASE_BATCH_JOBS)."""
+    done = False
+    while not done:
+        batch = []
+        item = inbox.get()
+        while item is not STAGE_DONE:
+            batch.append(item)
+            if len(batch) >= PARAPHRASE_BATCH_JOBS:
+                break
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                break
+        done = item is STAGE_DONE
+        if not batch:
+            continue
+        logger.info(f"Paraphrasing {len(batch)} queued jobs ({inbox.qsize()} more waiting, {outbox.qsize()} waiting to publish)")
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=10)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            job_links = ['https://www.myjobmag.co.ke' + a.get('href') for a in soup.select('li.mag-b > h2 > a') if a.get('href')]
-            print(f"Collected {len(job_links)} job URLs from page {i}")
-            for index, job_url in enumerate(job_links):
-                job_number = index + 1
-                print(f"\nProcessing job {job_number} from page {i}: {job_url}")
-                if job_url in processed_job_urls:
-                    print(f"Skipping job {job_number}: URL {job_url} already processed.")
-                    continue
-                job_data, company_data = scrape_job_details(job_url)
-                if not job_data or not company_data:
-                    print(f"Failed to scrape job details from {job_url}")
-                    continue
-                job_data['URL Page'] = str(i)
-                job_data['Job Number'] = str(job_number)
-                print(f"\nRaw Scraped Data for Job {job_number} (Job ID: {job_data.get('Job ID', '')})")
-                print("-" * 50)
-                for key, value in job_data.items():
-                    print(f"{key}: {value}")
-                print("-" * 50)
-                job_id = str(job_data.get("Job ID", ""))
-                job_title = job_data.get("Job Title", "")
-                job_description = job_data.get("Job Description", "")
-                application = job_data.get("Application", "")
-                company_name = job_data.get("Company", "Unknown Company")
-                if not job_id or pd.isna(job_id):
-                    print(f"Skipping job {job_number}: Empty or invalid Job ID.")
-                    continue
-                if job_id in kenya_processed_job_ids:
-                    print(f"Skipping job {job_number}: Job ID {job_id} already processed.")
-                    continue
-                if not job_title or pd.isna(job_title):
-                    print(f"Skipping job {job_number}: Empty or invalid job title.")
-                    continue
-                if not job_description or pd.isna(job_description):
-                    print(f"Skipping job {job_number}: Empty or invalid job description.")
-                    continue
-                if company_name not in processed_companies and company_name != "Unknown Company":
-                    company_post_id, company_post_url = save_company_to_wordpress(index, company_data)
-                    if company_post_id:
-                        print(f"Successfully posted company {company_name} to WordPress. Post ID: {company_post_id}, URL: {company_post_url}")
-                    else:
-                        print(f"Failed to post company {company_name} to WordPress.")
-                extracted_title = extract_job_title(job_title)
-                print(f"\nParaphrasing Job Title and Description for Job ID: {job_id}")
-                print("-" * 30)
-                print(f"Extracted Job Title: {extracted_title}")
-                combined_paraphrased, rewritten_title, rewritten_description = paraphrase_title_and_description(
-                    extracted_title,
-                    job_description,
-                    index,
-                    max_attempts=5
-                )
-                post_id, post_url = save_article_to_wordpress(index, job_data, rewritten_title, rewritten_description, application)
-                if post_id:
-                    print(f"Successfully posted job {job_number} (Job ID: {job_id}, URL: {job_url}) to WordPress. Post ID: {post_id}, URL: {post_url}")
-                else:
-                    print(f"Failed to post job {job_number} (Job ID: {job_id}, URL: {job_url}) to WordPress.")
-                    save_processed_job_id(job_id, job_url, company_name, i, job_number)
-                    time.sleep(10)
-                if job_number % 10 == 0:
-                    logger.info("Pausing for 30 seconds to avoid server overload")
-                    time.sleep(30)
-            save_last_processed_page(i)
+            warm_up_models()
+            job_paraphrases, company_paraphrases = paraphrase_page_jobs(
+                [(job_data, company_data) for _, _, job_data, company_data in batch],
+                processed_companies,
+                max_attempts=5
+            )
+            forwarded = [
+                (page, index, job_data, company_data, paraphrased, company_paraphrases.get(job_data.get("Company", "Unknown Company")))
+                for (page, index, job_data, company_data), paraphrased in zip(batch, job_paraphrases)
+            ]
         except Exception as e:
-            print(f"Error crawling page {url}: {str(e)}")
-            logger.error(f"Error crawling page {url}: {str(e)}")
-            save_last_processed_page(i)
+            # Not forwarded and not recorded as processed: the next cycle scrapes them again,
+            # instead of the publish stage re-running inference one job at a time.
+            logger.error(f"Error paraphrasing batch of {len(batch)} jobs: {str(e)}. Skipping them until the next cycle.")
+            continue
+        for item in forwarded:
+            outbox.put(item)
+
+
+def publish_stage(inbox, pages, processed_companies):
+    """Publish paraphrased jobs (and their companies) to WordPress until told to stop.
+
+    With PUBLISH_BATCH_JOBS set, whatever has queued up (up to that many jobs) is published
+    together by publish_batch; otherwise each job is posted on its own.
+    """
+    done = False
+    while not done:
+        batch = []
+        item = inbox.get()
+        while item is not STAGE_DONE:
+            batch.append(item)
+            if len(batch) >= PUBLISH_BATCH_JOBS or not wordpress.batch_supported:
+                break
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                break
+        done = item is STAGE_DONE
+        if len(batch) == 1:
+            i, index, job_data, company_data, paraphrased, company_paraphrased = batch[0]
+            try:
+                publish_job(i, index, job_data, company_data, paraphrased, company_paraphrased, processed_companies)
+            except Exception as e:
+                logger.error(f"Error publishing job {index + 1} from page {i}: {str(e)}")
+        elif batch:
+            try:
+                publish_batch(batch, processed_companies)
+            except Exception as e:
+                logger.error(f"Error publishing batch of {len(batch)} jobs: {str(e)}")
+        for item in batch:
+            try:
+                pages.published(item[0])
+            except Exception as e:
+                logger.error(f"Error recording progress of page {item[0]}: {str(e)}")
+
+
+def rewrite_job(index, job_data, paraphrased):
+    """(rewritten title, rewritten description) for a job, taken from its batch paraphrase when there is one."""
+    extracted_title = extract_job_title(job_data.get("Job Title", ""))
+    print(f"\nParaphrasing Job Title and Description for Job ID: {job_data.get('Job ID', '')}")
+    print("-" * 30)
+    print(f"Extracted Job Title: {extracted_title}")
+    combined_paraphrased, rewritten_title, rewritten_description = paraphrase_title_and_description(
+        extracted_title,
+        job_data.get("Job Description", ""),
+        index,
+        max_attempts=5,
+        paraphrased=paraphrased
+    )
+    return rewritten_title, rewritten_description
+
+
+def publish_job(i, index, job_data, company_data, paraphrased, company_paraphrased, processed_companies):
+    company_name = job_data.get("Company", "Unknown Company")
+    if company_name not in processed_companies and company_name != "Unknown Company":
+        company_post_id, company_post_url = save_company_to_wordpress(index, company_data, paraphrased=company_paraphrased)
+        if company_post_id:
+            print(f"Successfully posted company {company_name} to WordPress. Post ID: {company_post_id}, URL: {company_post_url}")
+        else:
+            print(f"Failed to post company {company_name} to WordPress.")
+    rewritten_title, rewritten_description = rewrite_job(index, job_data, paraphrased)
+    publish_rewritten_job(i, index, job_data, rewritten_title, rewritten_description)
+
+
+def publish_rewritten_job(i, index, job_data, rewritten_title, rewritten_description, post_data=None):
+    job_number = index + 1
+    job_id = str(job_data.get("Job ID", ""))
+    job_url = job_data.get("Job URL", "")
+    post_id, post_url = save_article_to_wordpress(index, job_data, rewritten_title, rewritten_description, job_data.get("Application", ""), post_data=post_data)
+    if post_id:
+        print(f"Successfully posted job {job_number} (Job ID: {job_id}, URL: {job_url}) to WordPress. Post ID: {post_id}, URL: {post_url}")
+    else:
+        # Left out of the ledger, so the job is scraped and tried again next cycle
+        print(f"Failed to post job {job_number} (Job ID: {job_id}, URL: {job_url}) to WordPress.")
+
+
+def record_published_jobs(items, post, outcome):
+    """Log queued jobs that ended up as `post` and add them to the processed ledger."""
+    for i, index, job_data, *_ in items:
+        job_id = str(job_data.get("Job ID", ""))
+        logger.info(f"Job {index + 1} (Job ID: {job_id}) {outcome}: Post ID {post.get('id')}, URL {post.get('link')}")
+        print(f"Job {index + 1} (Job ID: {job_id}) {outcome}: Post ID {post.get('id')}, URL {post.get('link')}")
+        save_processed_job_id(
+            job_id,
+            sanitize_text(job_data.get("Job URL", ""), is_url=True),
+            sanitize_text(job_data.get("Company", "Unknown Company")),
+            job_data.get('URL Page', ''),
+            job_data.get('Job Number', '')
+        )
+
+
+def publish_batch(batch, processed_companies):
+    """Publish queued jobs, and companies not yet on the site, through WordPress's batch endpoint.
+
+    Existing jobs are found with one slug lookup instead of one GET each; the rest are
+    created WP_BATCH_MAX posts per request. Each result is mapped back to its jobs (ledger)
+    or company (entity cache). Posts that failed with a retryable status (network error,
+    408/429, 5xx) are sent again, once any job that was created despite its error has been
+    picked up (companies through the entity cache, jobs through one slug lookup). Anything
+    still failing, rejected outright, or left over because the site cannot batch, is posted
+    on its own through the regular path; a job is recorded as processed only once a post
+    exists for it. Jobs sharing a slug are published once, as save_article_to_wordpress
+    would skip the later ones.
+    """
+    companies = {}
+    for i, index, job_data, company_data, paraphrased, company_paraphrased in batch:
+        company_name = job_data.get("Company", "Unknown Company")
+        if company_name in processed_companies or company_name == "Unknown Company":
             continue
-    
+        company_slug = wp_slug(sanitize_text(company_data.get("company_name", "Unknown Company")))
+        if company_slug not in companies and not wp_entity_cache.company(company_slug):
+            companies[company_slug] = build_company_post(company_data, paraphrased=company_paraphrased)
+
+    jobs = {}
+    for item in batch:
+        i, index, job_data, company_data, paraphrased, company_paraphrased = item
+        rewritten_title, rewritten_description = rewrite_job(index, job_data, paraphrased)
+        job = jobs.setdefault(job_title_slug(index, job_data, rewritten_title), {"items": [], "rewritten": (rewritten_title, rewritten_description)})
+        job["items"].append(item)
+    try:
+        existing = wordpress.find_by_slugs(WP_URL, list(jobs))
+    except (RequestException, ValueError) as e:
+        logger.warning(f"Error checking for existing jobs in a batch of {len(jobs)}: {str(e)}. Proceeding to create new posts.")
+        existing = {}
+    for slug, post in existing.items():
+        record_published_jobs(jobs.pop(slug)["items"], post, "already exists in WordPress")
+    for job in jobs.values():
+        i, index, job_data = job["items"][0][:3]
+        job["post"] = build_job_post(index, job_data, *job["rewritten"], job_data.get("Application", ""))
+
+    def company_created_despite_error(slug, post_data):
+        # The entity cache asks the server about slugs it does not know
+        company = wp_entity_cache.company(slug)
+        if company:
+            logger.info(f"Company {post_data['title']} was created despite error: Post ID {company[0]}, URL {company[1]}")
+        return company
+
+    pending = [(WP_COMPANY_URL, slug, post_data) for slug, post_data in companies.items()]
+    pending += [(WP_URL, slug, job["post"]) for slug, job in jobs.items()]
+    unbatched = []
+    max_retries = 3
+    for attempt in range(max_retries):
+        logger.info(f"Publishing {len(pending)} posts in one batch round (attempt {attempt + 1})")
+        results = wordpress.batch([("POST", url, post_data) for url, slug, post_data in pending])
+        retry = []
+        for (url, slug, post_data), (status, body) in zip(pending, results):
+            if status and 200 <= status < 300:
+                if url == WP_COMPANY_URL:
+                    wp_entity_cache.add_company(slug, body.get("id"), body.get("link"))
+                    logger.info(f"Successfully posted company {post_data['title']} to WordPress: Post ID {body.get('id')}, URL {body.get('link')}")
+                else:
+                    record_published_jobs(jobs.pop(slug)["items"], body, "posted to WordPress")
+                continue
+            logger.error(f"Attempt {attempt + 1} failed for {'company' if url == WP_COMPANY_URL else 'job'} {slug}: Status: {status}, Response: {body}")
+            if body.get("code") == "rest_batch_not_allowed":
+                wordpress.batch_supported = False
+            if status is None or status in (408, 429) or status >= 500:
+                retry.append((url, slug, post_data))
+            else:
+                unbatched.append((url, slug, post_data))
+        pending = retry
+        if not pending or not wordpress.batch_supported:
+            break
+        try:
+            for slug, post in wordpress.find_by_slugs(WP_URL, [slug for url, slug, _ in pending if url == WP_URL]).items():
+                record_published_jobs(jobs.pop(slug)["items"], post, "was created despite error")
+        except (RequestException, ValueError) as check_e:
+            logger.error(f"Error checking for existing jobs after failed batch attempt {attempt + 1}: {check_e}")
+        pending = [
+            (url, slug, post_data) for url, slug, post_data in pending
+            if (slug in jobs if url == WP_URL else not company_created_despite_error(slug, post_data))
+        ]
+        if pending and attempt < max_retries - 1:
+            logger.info(f"Retrying {len(pending)} failed posts after {2 ** attempt} seconds...")
+            idle_sleep(2 ** attempt, "wordpress retry")
+
+    unbatched += pending
+    if not wordpress.batch_supported:
+        logger.warning(f"{WP_BATCH_URL} cannot create these posts; publishing one at a time from now on")
+    for url, slug, post_data in unbatched:
+        if url == WP_COMPANY_URL:
+            if company_created_despite_error(slug, post_data):
+                continue
+            logger.warning(f"Posting company {post_data['title']} on its own after the batch failed")
+            try:
+                post = wordpress.create_company(post_data)
+                wp_entity_cache.add_company(slug, post.get("id"), post.get("link"))
+                logger.info(f"Successfully posted company {post_data['title']} to WordPress: Post ID {post.get('id')}, URL {post.get('link')}")
+            except (RequestException, ValueError) as e:
+                logger.error(f"Failed to post company {post_data['title']}: {str(e)}")
+            continue
+        logger.warning(f"Posting job {slug} on its own after the batch failed")
+        for i, index, job_data, *_ in jobs[slug]["items"]:
+            publish_rewritten_job(i, index, job_data, *jobs[slug]["rewritten"], post_data=post_data)
+
+
+def stop_pipeline(queues, threads, timeout=STAGE_STOP_SECONDS):
+    """Stop the stage threads without working through their queues, for a run that is being killed.
+
+    Queued jobs are dropped; they are not in the ledger, so the next run scrapes them again.
+    Each stage gets up to `timeout` seconds to finish the jobs in hand, then whatever was
+    published is committed to the ledger.
+    """
+    logger.warning(f"Stopping the pipeline: dropping {sum(q.qsize() for q in queues)} queued jobs until the next run")
+    for stage_queue in queues:
+        try:
+            while True:
+                stage_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            stage_queue.put(STAGE_DONE, timeout=1)
+        except queue.Full:
+            pass
+    deadline = time.time() + timeout
+    for thread in threads:
+        thread.join(max(0, deadline - time.time()))
+    get_processed_jobs_ledger().flush()
+
+
+def crawl_and_process():
+    """Run one cycle as a scrape -> paraphrase -> publish pipeline joined by bounded queues."""
+    started = time.time()
+    IDLE_SECONDS.clear()
+    wp_entity_cache.reset()
+    kenya_processed_job_ids, processed_job_urls, processed_companies = load_kenya_processed_job_ids()
+    print(f"Loaded {len(kenya_processed_job_ids)} previously processed Job IDs, {len(processed_job_urls)} URLs, and {len(processed_companies)} companies")
+    paraphrase_queue = StageQueue("scraped -> paraphrase")
+    publish_queue = StageQueue("paraphrased -> publish")
+    pages = PageProgress()
+    # One thread per stage: the generation engine, torch's thread count and the WordPress
+    # entity cache are shared state, so paraphrasing and publishing each stay serial.
+    # Daemon threads, so a run that is being stopped never waits on them to exit.
+    paraphraser = threading.Thread(target=run_stage, args=(paraphrase_stage, paraphrase_queue, publish_queue, processed_companies), name="paraphrase", daemon=True)
+    publisher = threading.Thread(target=run_stage, args=(publish_stage, publish_queue, pages, processed_companies), name="publish", daemon=True)
+    paraphraser.start()
+    publisher.start()
+
+    stopping = False
+    try:
+        scrape_stage(paraphrase_queue, pages, kenya_processed_job_ids, processed_job_urls)
+    except (SystemExit, KeyboardInterrupt):
+        stopping = True
+        raise
+    finally:
+        if stopping:
+            stop_pipeline([paraphrase_queue, publish_queue], [paraphraser, publisher])
+        else:
+            # Drain: each stage finishes its queued work before the next one is told to stop.
+            # Done even if scraping raised, so the stage threads never wait on an empty queue forever.
+            paraphrase_queue.put(STAGE_DONE)
+            paraphraser.join()
+            publish_queue.put(STAGE_DONE)
+            publisher.join()
+
+    get_processed_jobs_ledger().flush()
+    get_processed_jobs_ledger().log_stats()
+    paraphrase_queue.log_stats()
+    publish_queue.log_stats()
+    log_candidate_filter_stats()
+    generation_engine.log_stats()
+    get_paraphrase_cache().log_stats()
+    grammar_service.log_stats()
+    http_cache.log_stats()
+    get_url_resolver().log_stats()
+    rate_limiter.log_stats()
+    wp_entity_cache.log_stats()
+    wordpress.log_stats()
+    log_idle_stats(started)
+    if RESOURCE_LOAD_SECONDS:
+        logger.info(f"Resource load times: {dict((name, round(seconds, 1)) for name, seconds in RESOURCE_LOAD_SECONDS.items())}")
+
+
+def listing_snapshot():
+    """Job URLs currently on listing page 1, or None if it could not be read."""
+    try:
+        return set(fetch_listing_page(1))
+    except Exception as e:
+        logger.error(f"Error checking page 1 for new listings: {str(e)}")
+        return None
+
+
+def wait_for_new_listings(seen):
+    """Block until page 1 lists a job not in `seen`, or CYCLE_MAX_WAIT has passed.
+
+    `seen` is page 1 as the finished cycle scraped it, so anything posted during a long
+    cycle starts the next one straight away. Otherwise page 1 is revalidated with a
+    conditional GET after CYCLE_POLL_MIN seconds, doubling the gap up to CYCLE_POLL_MAX.
+    """
+    started = time.time()
+    interval = CYCLE_POLL_MIN
+    while True:
+        current = listing_snapshot()
+        if current is not None and seen is not None and current - seen:
+            logger.info(f"{len(current - seen)} new listings on page 1 after {time.time() - started:.0f}s")
+            return
+        if seen is None:
+            seen = current
+        waited = time.time() - started
+        if waited >= CYCLE_MAX_WAIT:
+            logger.info(f"No new listings on page 1 after {CYCLE_MAX_WAIT}s; starting the next cycle anyway")
+            return
+        idle_sleep(min(interval, CYCLE_MAX_WAIT - waited), "waiting for new listings")
+        interval = min(interval * 2, CYCLE_POLL_MAX)
+
 
 def main():
+    # A runner's SIGTERM becomes SystemExit here in the main thread: crawl_and_process stops the
+    # (daemon) stage threads and commits the ledger, and atexit then closes it and the other resources
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
     max_cycles = 10
     cycle_count = 0
     while cycle_count < max_cycles:
         print(f"\nStarting cycle {cycle_count + 1} of job processing...")
+        seen = listing_snapshot()
         crawl_and_process()
         cycle_count += 1
-        print(f"\nAll jobs processed for cycle {cycle_count}. Waiting 5 minutes before starting the next cycle...")
-        time.sleep(7200)  # 2 hours in seconds
+        if cycle_count < max_cycles:
+            print(f"\nAll jobs processed for cycle {cycle_count}. Waiting for new listings before starting the next cycle...")
+            wait_for_new_listings(seen)
     print("Reached maximum cycles. Exiting.")
 
 if __name__ == "__main__":
+    configure_logging()
     main()